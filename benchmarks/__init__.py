@@ -0,0 +1 @@
+"""Benchmarks of the F&F Fox devices integration."""
@@ -0,0 +1,306 @@
+"""Benchmark F&F Fox devices integration against stub devices.
+
+Integration is set up with all four platforms in Home Assistant test
+instance, devices are served by stub server running in separate process
+(see stub_server.py), so measured CPU time belongs to integration only.
+Every fleet size runs for given duration of regular poll cycles with
+optional command bursts sent with bulk_set service.
+
+Reported per fleet size, per polling interval: device fetches of regular
+polls, out of schedule refreshes (command confirmations), metering and
+commands as recorded by integration metrics, and HTTP requests received by
+stub devices split into state, metering and command methods (one fetch may
+send a few HTTP requests). Regular poll fetches per interval should not
+exceed number of devices. Also reported: phase slot duration p50/p99 (slot
+is fraction of polling interval in which its due devices are polled),
+command burst duration p50/p99, CPU time and peak RSS.
+
+Run from repository root with requirements_test.txt installed:
+
+    python -m benchmarks.coordinator_benchmark --devices 10 100 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import random
+import resource
+import tempfile
+from time import monotonic, process_time
+
+import aiohttp
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from custom_components.fandffox.const import (
+    DOMAIN,
+    SCHEMA_INPUT_MAX_CONCURRENCY,
+    SCHEMA_INPUT_PROBE_POLLING,
+    SCHEMA_INPUT_REDISCOVERY_INTERVAL,
+    SCHEMA_INPUT_UPDATE_POOLING,
+    SERVICE_BULK_SET,
+)
+from custom_components.fandffox.metrics import get_percentile
+from homeassistant import loader
+
+from .stub_server import (
+    DEFAULT_CONTROL_PORT,
+    DEFAULT_PORT_BASE,
+    STUB_HOST,
+    build_fleet,
+    run_stub_server,
+)
+
+# Entity domains which state is changed by command bursts.
+COMMAND_DOMAINS = ("cover", "light", "switch")
+# Stub server start timeout (in seconds).
+SERVER_START_TIMEOUT = 30
+# Stub device methods of energy meter readings.
+METERING_METHODS = ("get_current_energy", "get_total_energy")
+# Report legend.
+REPORT_LEGEND = (
+    "*_per_interval: means per polling interval, fetch counts come from\n"
+    "integration metrics, http_* from stub server; slot: phase slot of polling\n"
+    "interval in which its due devices are polled."
+)
+
+
+async def async_get_control(control_port: int, path: str) -> dict:
+    """Call stub server control endpoint."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"http://{STUB_HOST}:{control_port}{path}") as resp:
+            return await resp.json()
+
+
+async def async_wait_for_server(control_port: int):
+    """Wait until stub server accepts requests."""
+    deadline = monotonic() + SERVER_START_TIMEOUT
+    while True:
+        try:
+            await async_get_control(control_port, "/_stats")
+            return
+        except aiohttp.ClientConnectionError:
+            if monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def async_create_hass(config_dir: str):
+    """Create Home Assistant test instance loading integration from repository."""
+    hass = await async_test_home_assistant(asyncio.get_running_loop())
+    hass.config.config_dir = config_dir
+    hass.data.pop(loader.DATA_CUSTOM_COMPONENTS)
+    return hass
+
+
+async def async_command_burst(hass, rng: random.Random, size: int) -> float:
+    """Set random state of random entities with one bulk_set call.
+
+    Return: burst duration (in seconds).
+    """
+    entity_ids = [
+        entity_id
+        for domain in COMMAND_DOMAINS
+        for entity_id in hass.states.async_entity_ids(domain)
+    ]
+    targets = [
+        {"entity_id": entity_id, "state": rng.random() < 0.5}
+        for entity_id in rng.sample(entity_ids, min(size, len(entity_ids)))
+    ]
+    started = monotonic()
+    await hass.services.async_call(
+        DOMAIN, SERVICE_BULK_SET, {"targets": targets}, blocking=True
+    )
+    return monotonic() - started
+
+
+def get_http_requests(methods: dict[str, int]) -> dict[str, int]:
+    """Return stub server request counts split by kind."""
+    requests = {"state": 0, "metering": 0, "command": 0}
+    for method, count in methods.items():
+        if method in METERING_METHODS:
+            requests["metering"] += count
+        elif method.startswith("set_"):
+            requests["command"] += count
+        else:
+            requests["state"] += count
+    return requests
+
+
+def get_peak_rss() -> float:
+    """Return peak resident memory of process (in MB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def async_drive(args, count: int) -> dict:
+    """Set up integration with fleet and drive it for configured duration."""
+    rng = random.Random(args.seed)
+    fleet = build_fleet(count, args.port_base)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            version=2,
+            data={"discovered_devices": [device.get_config() for device in fleet]},
+            options={
+                SCHEMA_INPUT_REDISCOVERY_INTERVAL: 0,
+                SCHEMA_INPUT_UPDATE_POOLING: args.pooling,
+                SCHEMA_INPUT_MAX_CONCURRENCY: args.max_concurrency,
+                SCHEMA_INPUT_PROBE_POLLING: args.probe_polling,
+            },
+        )
+        entry.add_to_hass(hass)
+        setup_started = monotonic()
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        setup_duration = monotonic() - setup_started
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+
+        await async_get_control(args.control_port, "/_reset")
+        first_interval = coordinator.metrics.intervals
+        cpu_started = process_time()
+        bursts = []
+        started = monotonic()
+        next_burst = started + args.burst_interval
+        while monotonic() - started < args.duration:
+            await asyncio.sleep(0.1)
+            if args.burst_size and monotonic() >= next_burst:
+                bursts.append(await async_command_burst(hass, rng, args.burst_size))
+                next_burst += args.burst_interval
+        cpu_time = process_time() - cpu_started
+        elapsed = monotonic() - started
+        stats = await async_get_control(args.control_port, "/_stats")
+        metrics = coordinator.metrics.as_dict()
+        intervals = coordinator.metrics.intervals - first_interval
+        entities = len(hass.states.async_all())
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop(force=True)
+    fetches = metrics["requests_per_interval"]
+    http_requests = get_http_requests(stats["methods"])
+    elapsed_intervals = elapsed / args.pooling
+    return {
+        "devices": count,
+        "entities": entities,
+        "setup_s": setup_duration,
+        "intervals": intervals,
+        "poll_per_interval": fetches["poll"],
+        "refresh_per_interval": fetches["refresh"],
+        "metering_per_interval": fetches["metering"],
+        "command_per_interval": fetches["command"],
+        "http_state_per_interval": http_requests["state"] / elapsed_intervals,
+        "http_metering_per_interval": http_requests["metering"] / elapsed_intervals,
+        "http_command_per_interval": http_requests["command"] / elapsed_intervals,
+        "failed_requests": stats["failures"],
+        "slot_p50_ms": to_ms(metrics["slot_duration_p50"]),
+        "slot_p99_ms": to_ms(metrics["slot_duration_p99"]),
+        "burst_p50_ms": to_ms(get_percentile(bursts, 50)),
+        "burst_p99_ms": to_ms(get_percentile(bursts, 99)),
+        "cpu_s": cpu_time,
+        "cpu_pct": 100 * cpu_time / elapsed,
+        "peak_rss_mb": get_peak_rss(),
+    }
+
+
+def to_ms(value: float | None) -> float | None:
+    """Convert seconds to milliseconds."""
+    return None if value is None else value * 1000
+
+
+async def async_run_scenario(args, count: int) -> dict:
+    """Run stub server with fleet in separate process and drive integration."""
+    server = multiprocessing.Process(
+        target=run_stub_server,
+        args=(
+            count,
+            args.port_base,
+            args.control_port,
+            args.latency,
+            args.jitter,
+            args.failure_rate,
+            args.change_rate,
+            args.seed,
+        ),
+        daemon=True,
+    )
+    server.start()
+    try:
+        await async_wait_for_server(args.control_port)
+        return await async_drive(args, count)
+    finally:
+        server.terminate()
+        server.join()
+
+
+def format_value(value) -> str:
+    """Format report value."""
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return str(value)
+
+
+def print_report(results: list[dict]):
+    """Print results table."""
+    columns = list(results[0])
+    widths = [
+        max(len(column), *(len(format_value(result[column])) for result in results))
+        for column in columns
+    ]
+    print("  ".join(column.rjust(width) for column, width in zip(columns, widths)))
+    for result in results:
+        print(
+            "  ".join(
+                format_value(result[column]).rjust(width)
+                for column, width in zip(columns, widths)
+            )
+        )
+
+
+def main():
+    """Run benchmark from command line."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--devices", type=int, nargs="+", default=[10, 50, 100, 500])
+    parser.add_argument("--duration", type=float, default=60, help="seconds per fleet size")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--change-rate", type=float, default=0.01, help="devices changed per second"
+    )
+    parser.add_argument("--burst-size", type=int, default=10, help="0 disables bursts")
+    parser.add_argument("--burst-interval", type=float, default=10, help="seconds")
+    parser.add_argument("--pooling", type=int, default=5, help="seconds")
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    parser.add_argument("--probe-polling", action="store_true")
+    parser.add_argument("--port-base", type=int, default=DEFAULT_PORT_BASE)
+    parser.add_argument("--control-port", type=int, default=DEFAULT_CONTROL_PORT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write results to given file")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+
+    results = []
+    for count in args.devices:
+        results.append(asyncio.run(async_run_scenario(args, count)))
+        print_report(results[-1:])
+    print()
+    print_report(results)
+    print(REPORT_LEGEND)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""Micro-benchmark of entity state writes on coordinator refresh.
+
+Integration is set up with all four platforms in Home Assistant test
+instance, device requests are replaced with no-op, so only the refresh
+path is measured: coordinator pushes update to every entity, entity
+compares its snapshot and writes state. Every round changes state of
+all devices, so every entity writes its state.
+
+Entity metadata read on every state write (name, supported features,
+device class, color mode) is precomputed at construction. With --compare
+the benchmark runs also with that metadata served by properties computed
+on every read, as it was done before. Unique ID and device info are read
+only when entity is registered, so they are not part of refresh path.
+
+Variants are measured in the same process, interleaved over --repeat
+repetitions with alternating order, every repetition on fresh Home
+Assistant instance. Median and min-max spread of CPU time per refresh
+are reported, with saving computed from paired repetitions.
+
+Run from repository root with requirements_test.txt installed:
+
+    python -m benchmarks.entity_benchmark --devices 100 --compare
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from contextlib import ExitStack
+import logging
+from statistics import median
+import tempfile
+from time import process_time
+from unittest.mock import patch
+
+from foxrestapiclient.devices.fox_dim1s2_device import FoxDIM1S2Device
+from foxrestapiclient.devices.fox_led2s2_device import FoxLED2S2Device
+from foxrestapiclient.devices.fox_r1s1_device import FoxR1S1Device
+from foxrestapiclient.devices.fox_r2s2_device import FoxR2S2Device
+from foxrestapiclient.devices.fox_rgbw_device import FoxRGBWDevice
+from foxrestapiclient.devices.fox_str1s2_device import FoxSTR1S2Device
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+import custom_components.fandffox as fandffox
+from custom_components.fandffox.const import DOMAIN, SCHEMA_INPUT_REDISCOVERY_INTERVAL
+from custom_components.fandffox.cover import FoxBaseCover
+from custom_components.fandffox.light import (
+    FoxBaseLight,
+    FoxDimmableLight,
+    FoxRGBWLight,
+)
+from custom_components.fandffox.sensor import FoxGenericSensor
+from custom_components.fandffox.switch import FoxBaseSwitch
+from homeassistant.components.cover import (
+    DEVICE_CLASS_BLIND,
+    SUPPORT_CLOSE,
+    SUPPORT_OPEN,
+    SUPPORT_SET_POSITION,
+    SUPPORT_STOP,
+)
+from homeassistant.components.light import (
+    COLOR_MODE_BRIGHTNESS,
+    SUPPORT_BRIGHTNESS,
+    SUPPORT_COLOR,
+    SUPPORT_EFFECT,
+)
+
+from .coordinator_benchmark import async_create_hass
+from .stub_server import build_fleet
+
+DEVICE_CLASSES = (
+    FoxDIM1S2Device,
+    FoxLED2S2Device,
+    FoxR2S2Device,
+    FoxRGBWDevice,
+    FoxSTR1S2Device,
+)
+
+
+def get_legacy_device_name(entity) -> str:
+    """Return device name read on every write."""
+    return entity._device.name  # pylint: disable=protected-access
+
+
+def get_legacy_switch_name(entity) -> str:
+    """Return switch name looked up on every write."""
+    device = entity._device  # pylint: disable=protected-access
+    channel = entity._channel  # pylint: disable=protected-access
+    return device.name if channel is None else device.get_channel_name(channel)
+
+
+def get_legacy_sensor_name(entity) -> str:
+    """Return sensor name computed on every read."""
+    device = entity._device  # pylint: disable=protected-access
+    name = device.name if device.name else "r1s1"
+    return f"{name}-{device.mac_addr}-sensor-{entity.entity_description.key}"
+
+
+def get_legacy_sensor_value(entity):
+    """Return sensor value looked up through entity description."""
+    device = entity._device  # pylint: disable=protected-access
+    return device.fetch_sensor_value_by_key(entity.entity_description.key)
+
+
+# Entity metadata served by properties, as before it was precomputed.
+LEGACY_PROPERTIES = {
+    FoxBaseSwitch: {"name": get_legacy_switch_name},
+    FoxBaseLight: {"name": get_legacy_device_name},
+    FoxBaseCover: {
+        "name": get_legacy_device_name,
+        "supported_features": lambda self: (
+            SUPPORT_OPEN | SUPPORT_CLOSE | SUPPORT_SET_POSITION | SUPPORT_STOP
+        ),
+        "device_class": lambda self: DEVICE_CLASS_BLIND,
+    },
+    FoxDimmableLight: {
+        "supported_features": lambda self: SUPPORT_BRIGHTNESS,
+        "color_mode": lambda self: COLOR_MODE_BRIGHTNESS,
+    },
+    FoxRGBWLight: {
+        "supported_features": lambda self: SUPPORT_BRIGHTNESS | SUPPORT_COLOR | SUPPORT_EFFECT,
+    },
+    FoxGenericSensor: {
+        "name": get_legacy_sensor_name,
+        "native_value": get_legacy_sensor_value,
+    },
+}
+
+
+async def async_fetch_noop(device):
+    """Replace device request."""
+    device.is_available = True
+
+
+def change_device(device, value: int):
+    """Change device state, so its entities write state."""
+    state = bool(value % 2)
+    if isinstance(device, (FoxLED2S2Device, FoxR2S2Device)):
+        device.channel_one_state = device.channel_two_state = state
+    elif isinstance(device, FoxDIM1S2Device):
+        device.state = state
+    elif isinstance(device, FoxSTR1S2Device):
+        device._cover_position = value % 101  # pylint: disable=protected-access
+    elif isinstance(device, FoxR1S1Device):
+        device._state = state  # pylint: disable=protected-access
+        device.all_sensor_values = {
+            key: str(value) for key in device.all_sensor_values
+        }
+    else:
+        device._state = state  # pylint: disable=protected-access
+
+
+async def async_measure(args, legacy: bool) -> dict:
+    """Set up integration and measure CPU time of refresh rounds."""
+    fleet = build_fleet(args.devices)
+    with ExitStack() as stack, tempfile.TemporaryDirectory() as config_dir:
+        for device_class in DEVICE_CLASSES:
+            stack.enter_context(
+                patch.object(device_class, "async_fetch_device_available_data", async_fetch_noop)
+            )
+        stack.enter_context(patch.object(fandffox, "async_fetch_relay_state", async_fetch_noop))
+        stack.enter_context(patch.object(fandffox, "async_fetch_meter_data", async_fetch_noop))
+        if legacy:
+            for entity_class, properties in LEGACY_PROPERTIES.items():
+                for name, getter in properties.items():
+                    stack.enter_context(patch.object(entity_class, name, property(getter)))
+
+        hass = await async_create_hass(config_dir)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            version=2,
+            data={"discovered_devices": [device.get_config() for device in fleet]},
+            options={SCHEMA_INPUT_REDISCOVERY_INTERVAL: 0},
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        #Only refreshes pushed by benchmark are measured
+        coordinator.update_interval = None
+        coordinator.metering_coordinator.update_interval = None
+        devices = coordinator.get_all_devices()
+        entities = len(hass.states.async_all())
+
+        cpu_time = 0.0
+        for value in range(args.warmup + args.rounds):
+            for device in devices:
+                change_device(device, value)
+            started = process_time()
+            coordinator.async_update_listeners()
+            coordinator.metering_coordinator.async_update_listeners()
+            if value >= args.warmup:
+                cpu_time += process_time() - started
+            await hass.async_block_till_done()
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop(force=True)
+    return {"entities": entities, "refresh_ms": cpu_time * 1000 / args.rounds}
+
+
+def format_spread(values: list[float], unit: str = "") -> str:
+    """Return median with min-max spread."""
+    return f"{median(values):.2f}{unit} [{min(values):.2f}..{max(values):.2f}]"
+
+
+def main():
+    """Run benchmark from command line."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=7, help="repetitions of every variant")
+    parser.add_argument(
+        "--compare", action="store_true", help="run also with metadata properties"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    variants = (False, True) if args.compare else (False,)
+    results: dict[bool, list[dict]] = {legacy: [] for legacy in variants}
+    for repetition in range(args.repeat):
+        #Alternating order, so slow drift of machine affects both variants
+        order = variants if repetition % 2 == 0 else variants[::-1]
+        for legacy in order:
+            results[legacy].append(asyncio.run(async_measure(args, legacy)))
+
+    entities = results[False][0]["entities"]
+    print(f"{entities} entities, {args.repeat} repetitions of {args.rounds} refreshes")
+    print("CPU ms per refresh, median [min..max]:")
+    for legacy in variants:
+        name = "properties" if legacy else "precomputed"
+        print(f"{name:>12}: {format_spread([r['refresh_ms'] for r in results[legacy]])}")
+    if args.compare:
+        savings = [
+            100 * (1 - precomputed["refresh_ms"] / legacy["refresh_ms"])
+            for precomputed, legacy in zip(results[False], results[True])
+        ]
+        print(f"Precomputed metadata saves {format_spread(savings, '%')} of refresh CPU time.")
+
+
+if __name__ == "__main__":
+    main()
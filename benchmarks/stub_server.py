@@ -0,0 +1,319 @@
+"""Local stub of F&F Fox RestAPI used by benchmarks.
+
+Every emulated device listens on its own 127.0.0.1 port, as real modules
+do on their own hosts, so per-host connection limits of the integration
+apply. Responses follow foxrestapiclient 0.1.15 formats. Latency, jitter,
+failure rate and rate of external state changes (e.g. wall switches) are
+configurable. Request counters are served on control port.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+
+from aiohttp import web
+from foxrestapiclient.devices.const import (
+    DEVICE_TYPE_DIM1S2,
+    DEVICE_TYPE_LED2S2,
+    DEVICE_TYPE_R1S1,
+    DEVICE_TYPE_R2S2,
+    DEVICE_TYPE_RGBW,
+    DEVICE_TYPE_STR1S2,
+    DEVICES,
+)
+
+STUB_HOST = "127.0.0.1"
+DEFAULT_PORT_BASE = 20000
+DEFAULT_CONTROL_PORT = 19999
+# Emulated device models, fleet is built from them round robin.
+STUB_DEVICE_TYPES = (
+    DEVICE_TYPE_LED2S2,
+    DEVICE_TYPE_DIM1S2,
+    DEVICE_TYPE_RGBW,
+    DEVICE_TYPE_R1S1,
+    DEVICE_TYPE_R2S2,
+    DEVICE_TYPE_STR1S2,
+)
+# Two channel device types.
+TWO_CHANNEL_TYPES = (DEVICE_TYPE_LED2S2, DEVICE_TYPE_R2S2)
+STATUS_OK = {"status": "ok"}
+
+
+def on_off(state: bool) -> str:
+    """Return RestAPI state value."""
+    return "on" if state else "off"
+
+
+class StubDevice:
+    """State and RestAPI methods of single emulated device."""
+
+    def __init__(self, index: int, dev_type: int, port: int) -> None:
+        """Initialize object."""
+        self.dev_type = dev_type
+        self.port = port
+        self.mac_addr = f"02:00:00:00:{index >> 8:02x}:{index & 0xFF:02x}"
+        self.api_key = f"key{index:04d}"
+        self.name = f"{DEVICES[dev_type].lower()}-{index}"
+        self.states = [False, False]
+        self.brightness = [128, 128]
+        self.hsv = [120, 50, 50]
+        self.level = 0
+        self.tilt = 0
+        self.energy = 1000.0
+
+    def get_config(self) -> dict:
+        """Return config entry data of device, as stored by config flow."""
+        return {
+            "name": self.name,
+            "host": f"{STUB_HOST}:{self.port}",
+            "api_key": self.api_key,
+            "mac_addr": self.mac_addr,
+            "dev_type": self.dev_type,
+            "channels": [1, 2] if self.dev_type in TWO_CHANNEL_TYPES else None,
+            "skip": False,
+        }
+
+    def change(self, rng: random.Random):
+        """Change device state externally."""
+        if self.dev_type == DEVICE_TYPE_STR1S2:
+            self.level = rng.randint(0, 100)
+        else:
+            channel = rng.randint(0, 1) if self.dev_type in TWO_CHANNEL_TYPES else 0
+            self.states[channel] = not self.states[channel]
+
+    def handle(self, method: str, query) -> dict | None:
+        """Return response of RestAPI method, None if method is not supported."""
+        channel = int(query.get("channel", 1)) - 1
+        if method == "get_device_info":
+            return {
+                **STATUS_OK,
+                "device_name": self.name,
+                "firmware": "1.0.0",
+                "hw": "1",
+                "updater": "1",
+                "device_friendly_name": self.name,
+                "device_commercial_name": DEVICES[self.dev_type],
+                "device_channels_name": [f"{self.name} 1", f"{self.name} 2"],
+            }
+        if method == "get_state":
+            if self.dev_type in TWO_CHANNEL_TYPES:
+                return {
+                    **STATUS_OK,
+                    "channel_1_state": on_off(self.states[0]),
+                    "channel_2_state": on_off(self.states[1]),
+                }
+            return {**STATUS_OK, "state": on_off(self.states[0])}
+        if method == "set_state":
+            self.states[channel] = query.get("state") == "on"
+            return STATUS_OK
+        if method == "get_brightness":
+            if self.dev_type == DEVICE_TYPE_LED2S2:
+                return {
+                    **STATUS_OK,
+                    "channel_1_value": str(self.brightness[0]),
+                    "channel_2_value": str(self.brightness[1]),
+                }
+            return {**STATUS_OK, "value": str(self.brightness[0])}
+        if method == "set_brightness":
+            self.brightness[channel] = int(query["value"])
+            return STATUS_OK
+        if method == "get_color_hsv":
+            return {**STATUS_OK, "h": self.hsv[0], "s": self.hsv[1], "v": self.hsv[2]}
+        if method == "set_color_hsv":
+            for index, key in enumerate("hsv"):
+                if key in query:
+                    self.hsv[index] = int(query[key])
+            return STATUS_OK
+        if method == "get_open_level":
+            return {**STATUS_OK, "level": str(self.level)}
+        if method == "set_open_level":
+            self.level = int(query["level"])
+            return STATUS_OK
+        if method == "get_open_louvers_level":
+            return {**STATUS_OK, "level": str(self.tilt)}
+        if method == "set_open_louvers_level":
+            self.tilt = int(query["level"])
+            return STATUS_OK
+        if method == "get_current_energy":
+            return {
+                **STATUS_OK,
+                "voltage": "230.1",
+                "current": "1.2",
+                "power_active": "250",
+                "power_reactive": "12",
+                "frequency": "50.0",
+                "power_factor": "0.98",
+            }
+        if method == "get_total_energy":
+            self.energy += 0.01
+            return {
+                **STATUS_OK,
+                "active_energy": f"{self.energy:.2f}",
+                "reactive_energy": "10.00",
+                "active_energy_import": f"{self.energy:.2f}",
+                "reactive_energy_import": "10.00",
+            }
+        return None
+
+
+def build_fleet(count: int, port_base: int = DEFAULT_PORT_BASE) -> list[StubDevice]:
+    """Return deterministic fleet of emulated devices."""
+    return [
+        StubDevice(index, STUB_DEVICE_TYPES[index % len(STUB_DEVICE_TYPES)], port_base + index)
+        for index in range(count)
+    ]
+
+
+class StubServer:
+    """Serve emulated devices over HTTP.
+
+    Failing request drops connection without response, as module which
+    went offline does.
+    """
+
+    def __init__(
+        self,
+        devices: list[StubDevice],
+        latency: float = 0.02,
+        jitter: float = 0.01,
+        failure_rate: float = 0.0,
+        change_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """Initialize object.
+
+        Keyword arguments:
+        latency -- mean response time (in seconds).
+        jitter -- maximal random deviation of response time (in seconds).
+        failure_rate -- fraction of requests which fail.
+        change_rate -- fraction of devices changing state every second.
+        """
+        self._devices = {device.api_key: device for device in devices}
+        self._latency = latency
+        self._jitter = jitter
+        self._failure_rate = failure_rate
+        self._change_rate = change_rate
+        self._random = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+        self._change_task: asyncio.Task | None = None
+        self.requests: dict[str, int] = {}
+        self.failures = 0
+
+    async def async_start(self, control_port: int | None = None):
+        """Start listening on device ports and control port."""
+        app = web.Application()
+        app.router.add_get("/_stats", self._async_handle_stats)
+        app.router.add_get("/_reset", self._async_handle_reset)
+        app.router.add_get("/{api_key}/{method}/", self._async_handle_request)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        ports = [device.port for device in self._devices.values()]
+        if control_port is not None:
+            ports.append(control_port)
+        for port in ports:
+            await web.TCPSite(self._runner, STUB_HOST, port, backlog=1024).start()
+        if self._change_rate > 0:
+            self._change_task = asyncio.create_task(self._async_change_states())
+
+    async def async_stop(self):
+        """Stop server."""
+        if self._change_task is not None:
+            self._change_task.cancel()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _async_change_states(self):
+        """Change state of random devices every second."""
+        devices = list(self._devices.values())
+        while True:
+            await asyncio.sleep(1)
+            for device in devices:
+                if self._random.random() < self._change_rate:
+                    device.change(self._random)
+
+    async def _async_handle_request(self, request: web.Request) -> web.StreamResponse:
+        """Handle RestAPI request of device."""
+        device = self._devices.get(request.match_info["api_key"])
+        if device is None or device.port != request.transport.get_extra_info("sockname")[1]:
+            raise web.HTTPNotFound()
+        method = request.match_info["method"]
+        self.requests[method] = self.requests.get(method, 0) + 1
+        delay = self._latency + self._random.uniform(-self._jitter, self._jitter)
+        await asyncio.sleep(max(0.0, delay))
+        if self._random.random() < self._failure_rate:
+            self.failures += 1
+            request.transport.close()
+            return web.Response()
+        response = device.handle(method, request.query)
+        if response is None:
+            return web.json_response({"status": "invalid_action_name"})
+        return web.Response(body=json.dumps(response).encode(), content_type="text/plain")
+
+    async def _async_handle_stats(self, request: web.Request) -> web.Response:
+        """Return request counters."""
+        return web.json_response(
+            {
+                "requests": sum(self.requests.values()),
+                "failures": self.failures,
+                "methods": self.requests,
+            }
+        )
+
+    async def _async_handle_reset(self, request: web.Request) -> web.Response:
+        """Reset request counters."""
+        self.requests = {}
+        self.failures = 0
+        return web.json_response(STATUS_OK)
+
+
+def run_stub_server(
+    count: int,
+    port_base: int,
+    control_port: int,
+    latency: float,
+    jitter: float,
+    failure_rate: float,
+    change_rate: float,
+    seed: int,
+):
+    """Run stub server of fleet until process is terminated."""
+
+    async def async_serve():
+        server = StubServer(
+            build_fleet(count, port_base), latency, jitter, failure_rate, change_rate, seed
+        )
+        await server.async_start(control_port)
+        await asyncio.Event().wait()
+
+    asyncio.run(async_serve())
+
+
+def main():
+    """Run stub server from command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--port-base", type=int, default=DEFAULT_PORT_BASE)
+    parser.add_argument("--control-port", type=int, default=DEFAULT_CONTROL_PORT)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--change-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps([device.get_config() for device in build_fleet(args.devices, args.port_base)]))
+    run_stub_server(
+        args.devices,
+        args.port_base,
+        args.control_port,
+        args.latency,
+        args.jitter,
+        args.failure_rate,
+        args.change_rate,
+        args.seed,
+    )
+
+
+if __name__ == "__main__":
+    main()
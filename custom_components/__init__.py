@@ -0,0 +1 @@
+"""Custom components of F&F Fox devices integration."""
@@ -3,8 +3,11 @@ from __future__ import annotations
 
 import asyncio
 from datetime import timedelta
+import ipaddress
 import logging
+from time import monotonic
 
+import aiohttp
 from foxrestapiclient.devices.const import (
     DEVICE_MODEL_DIM1S2,
     DEVICE_MODEL_LED2S2,
@@ -20,7 +23,7 @@ from foxrestapiclient.devices.const import (
     SUPPORTED_PLATFORM_SENSOR,
     SUPPORTED_PLATFORM_SWITCH,
 )
-from foxrestapiclient.devices.fox_base_device import DeviceData
+from foxrestapiclient.devices.fox_base_device import DeviceData, FoxBaseDevice
 from foxrestapiclient.devices.fox_dim1s2_device import FoxDIM1S2Device
 from foxrestapiclient.devices.fox_led2s2_device import FoxLED2S2Device
 from foxrestapiclient.devices.fox_r1s1_device import FoxR1S1Device
@@ -28,16 +31,94 @@ from foxrestapiclient.devices.fox_r2s2_device import FoxR2S2Device
 from foxrestapiclient.devices.fox_rgbw_device import FoxRGBWDevice
 from foxrestapiclient.devices.fox_str1s2_device import FoxSTR1S2Device
 
-from .const import DOMAIN
+from .aggregation import MeterAggregator
+from .cache import FoxDeviceCache
+from .const import (
+    BULK_RESULT_CHANGED,
+    BULK_RESULT_FAILED,
+    BULK_RESULT_NOT_FOUND,
+    BULK_RESULT_UNCHANGED,
+    CIRCUIT_MAX_BACKOFF,
+    CIRCUIT_MIN_BACKOFF,
+    CONFIRM_REFRESH_DELAY,
+    DEFAULT_DEVICE_TIMEOUT,
+    DEFAULT_DIAGNOSTIC_SENSORS,
+    DEFAULT_KEEP_ALIVE,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_METER_WINDOW,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_PROBE_POLLING,
+    DEFAULT_REDISCOVERY_INTERVAL,
+    DEFAULT_SENSOR_DEADBAND,
+    DOMAIN,
+    FULL_REFRESH_INTERVAL,
+    MAX_POOLING_INTERVAL,
+    METERING_INTERVAL,
+    MIN_POLL_TICK,
+    POLL_PHASE_SLOTS,
+    POOL_LIMIT_PER_HOST,
+    POOLING_INTERVAL,
+    SCHEMA_INPUT_DEVICE_TIMEOUT,
+    SCHEMA_INPUT_DIAGNOSTIC_SENSORS,
+    SCHEMA_INPUT_FULL_REFRESH_INTERVAL,
+    SCHEMA_INPUT_KEEP_ALIVE,
+    SCHEMA_INPUT_MAX_CONCURRENCY,
+    SCHEMA_INPUT_MAX_POOLING,
+    SCHEMA_INPUT_METER_WINDOW,
+    SCHEMA_INPUT_METERING_INTERVAL,
+    SCHEMA_INPUT_OPTIMISTIC,
+    SCHEMA_INPUT_POOL_SIZE,
+    SCHEMA_INPUT_PROBE_POLLING,
+    SCHEMA_INPUT_REDISCOVERY_INTERVAL,
+    SCHEMA_INPUT_SENSOR_DEADBAND,
+    SCHEMA_INPUT_UPDATE_POOLING,
+    SIGNAL_DEVICE_ADDED,
+    SIGNAL_DEVICE_REMOVED,
+)
+from .device_state import get_channel_state, get_device_snapshot
+from .discovery import async_shared_discover
+from .health import DeviceHealth, DeviceHealthMonitor
+from .lanes import (
+    PRIORITY_COMMAND,
+    PRIORITY_CONFIRM,
+    PRIORITY_POLL,
+    DeviceRequestGate,
+)
+from .metering import async_fetch_meter_data, async_fetch_relay_state
+from .metrics import (
+    REQUEST_METERING,
+    REQUEST_POLL,
+    REQUEST_REFRESH,
+    FoxMetrics,
+)
+from .probe import ChangeProbe
+from .rest_client import attach_client_session, create_pooled_session
+from .scheduler import AdaptivePollScheduler, get_phase
+from .services import async_setup_services, async_unload_services
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.util import Throttle
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
-_LOGGER.propagate = False
-THROTTLE_TIME = timedelta(seconds=1)
 # Supported platforms.
 PLATFORMS = ["cover", "light", "switch", "sensor"]
+# Options which cannot be applied to running coordinator.
+RELOAD_OPTIONS = {
+    SCHEMA_INPUT_POOL_SIZE,
+    SCHEMA_INPUT_KEEP_ALIVE,
+    SCHEMA_INPUT_SENSOR_DEADBAND,
+    SCHEMA_INPUT_DIAGNOSTIC_SENSORS,
+    SCHEMA_INPUT_METER_WINDOW,
+}
+# Errors of single device request or its malformed response.
+DEVICE_FETCH_ERRORS = (aiohttp.ClientError, ValueError, TypeError, KeyError)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -45,11 +126,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     #Set update callback
     entry.async_on_unload(entry.add_update_listener(update_listener))
-    fox_devices_coordinator = FoxDevicesCoordinator()
-    hass.data[DOMAIN][entry.entry_id] = fox_devices_coordinator
+    fox_devices_coordinator = FoxDevicesCoordinator(hass, entry)
     for device_config in entry.data["discovered_devices"]:
         fox_devices_coordinator.add_device_by_config(DeviceData(**device_config))
+    if await fox_devices_coordinator.async_restore_cache():
+        #Entities are created from cache, live refresh runs in background
+        hass.async_create_task(fox_devices_coordinator.async_refresh())
+    else:
+        #Single refresh shared by all platforms
+        await fox_devices_coordinator.async_config_entry_first_refresh()
+    hass.data[DOMAIN][entry.entry_id] = fox_devices_coordinator
     hass.config_entries.async_setup_platforms(entry, PLATFORMS)
+    async_setup_services(hass)
+    fox_devices_coordinator.async_schedule_polling(entry)
+    fox_devices_coordinator.async_schedule_rediscovery(entry)
     return True
 
 
@@ -57,107 +147,806 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        fox_devices_coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await fox_devices_coordinator.async_close()
+        if not hass.data[DOMAIN]:
+            async_unload_services(hass)
 
     return unload_ok
 
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove devices cache of removed config entry."""
+    await FoxDeviceCache(hass, entry.entry_id).async_remove()
+
+
 async def update_listener(hass, entry):
-    """Handle options update."""
-    await hass.config_entries.async_reload(entry.entry_id)
-
-class FoxDevicesCoordinator:
-    """Fox devices coordinator."""
-
-    def __init__(self) -> None:
-        """Store devices as map agregated by platform."""
-        self.__devices_map: dict[str, list] = {
-            SUPPORTED_PLATFORM_COVER: [],
-            SUPPORTED_PLATFORM_GATE: [],
-            SUPPORTED_PLATFORM_LIGHT: [],
-            SUPPORTED_PLATFORM_SENSOR: [],
-            SUPPORTED_PLATFORM_SWITCH: [],
+    """Handle options update, reload entry only if needed."""
+    fox_devices_coordinator = hass.data[DOMAIN].get(entry.entry_id)
+    if fox_devices_coordinator is None or not fox_devices_coordinator.async_apply_options(entry):
+        await hass.config_entries.async_reload(entry.entry_id)
+
+def get_option(entry: ConfigEntry, key: str, default):
+    """Return option value configured in entry or default one."""
+    return default if key not in entry.options else entry.options.get(key)
+
+
+def get_pooling_interval(entry: ConfigEntry) -> timedelta:
+    """Return polling interval configured in entry options."""
+    return timedelta(seconds=get_option(entry, SCHEMA_INPUT_UPDATE_POOLING, POOLING_INTERVAL))
+
+
+def get_poll_tick(entry: ConfigEntry) -> timedelta:
+    """Return interval of phase slot timer, fraction of polling interval."""
+    pooling_interval = get_pooling_interval(entry)
+    return max(pooling_interval / POLL_PHASE_SLOTS, timedelta(seconds=MIN_POLL_TICK))
+
+
+def create_change_probe(entry: ConfigEntry) -> ChangeProbe | None:
+    """Return change probe if two-tier polling is enabled in entry options."""
+    if not get_option(entry, SCHEMA_INPUT_PROBE_POLLING, DEFAULT_PROBE_POLLING):
+        return None
+    return ChangeProbe(
+        get_option(entry, SCHEMA_INPUT_FULL_REFRESH_INTERVAL, FULL_REFRESH_INTERVAL)
+    )
+
+
+def get_site_network(host: str):
+    """Return /24 network of device host, None if host is not IPv4 address."""
+    try:
+        return ipaddress.ip_network(f"{host}/24", strict=False)
+    except ValueError:
+        return None
+
+
+class FoxDevicesCoordinator(DataUpdateCoordinator):
+    """Fox devices coordinator.
+
+    One coordinator runs per config entry (site) with its own connection
+    pool, concurrency budget, intervals and health tracking, so slow site
+    does not delay other ones. It owns one refresh cycle for all platforms,
+    every device is fetched at most once per interval and the result is
+    shared by all its entities. Devices are polled in phase slots of the
+    interval and entities are notified only when polled state changed.
+
+    Fetches are limited by concurrency cap and per-device deadline, devices
+    which miss the deadline are marked unavailable and do not stall the
+    cycle. Devices which state does not change are polled less often, see
+    AdaptivePollScheduler. With two-tier polling devices are fully fetched
+    only when cheap probe detects change, see ChangeProbe. Failing devices
+    are skipped and only probed in background, see DeviceHealthMonitor.
+    R1S1 energy readings are refreshed by separate metering coordinator.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Store devices by MAC address with views agregated by platform."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            # Name of the data. For logging purposes.
+            name=DOMAIN,
+            # Devices are polled in phase slots by own timer, see async_schedule_polling.
+            update_interval=None,
+        )
+        max_concurrency = get_option(
+            entry, SCHEMA_INPUT_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+        )
+        self._fetch_semaphore = asyncio.Semaphore(max_concurrency)
+        self._command_semaphore = asyncio.Semaphore(max_concurrency)
+        self._device_timeout = get_option(
+            entry, SCHEMA_INPUT_DEVICE_TIMEOUT, DEFAULT_DEVICE_TIMEOUT
+        )
+        self.optimistic = get_option(entry, SCHEMA_INPUT_OPTIMISTIC, DEFAULT_OPTIMISTIC)
+        self.sensor_deadband = get_option(
+            entry, SCHEMA_INPUT_SENSOR_DEADBAND, DEFAULT_SENSOR_DEADBAND
+        )
+        self.diagnostic_sensors = get_option(
+            entry, SCHEMA_INPUT_DIAGNOSTIC_SENSORS, DEFAULT_DIAGNOSTIC_SENSORS
+        )
+        self.metrics = FoxMetrics(get_pooling_interval(entry).total_seconds())
+        self._change_probe = create_change_probe(entry)
+        meter_window = get_option(entry, SCHEMA_INPUT_METER_WINDOW, DEFAULT_METER_WINDOW)
+        self.meter_aggregator = MeterAggregator(meter_window) if meter_window > 0 else None
+        self._confirm_tasks: dict[str, asyncio.Task] = {}
+        self._probe_tasks: dict[str, asyncio.Task] = {}
+        self._poll_holds: dict[str, float] = {}
+        self._fetched_at: dict[str, float] = {}
+        self._commanded_at: dict[str, float] = {}
+        self._meter_fetches: dict[str, CALLBACK_TYPE] = {}
+        self._request_gates: dict[str, DeviceRequestGate] = {}
+        self._health = DeviceHealthMonitor(CIRCUIT_MIN_BACKOFF, CIRCUIT_MAX_BACKOFF)
+        self._metering_spread = get_option(
+            entry, SCHEMA_INPUT_METERING_INTERVAL, METERING_INTERVAL) / 2
+        self._poll_scheduler = AdaptivePollScheduler(
+            get_pooling_interval(entry).total_seconds(),
+            get_option(entry, SCHEMA_INPUT_MAX_POOLING, MAX_POOLING_INTERVAL),
+        )
+        #One keep-alive connection pool for all devices
+        self._session = create_pooled_session(
+            get_option(entry, SCHEMA_INPUT_POOL_SIZE, DEFAULT_POOL_SIZE),
+            POOL_LIMIT_PER_HOST,
+            get_option(entry, SCHEMA_INPUT_KEEP_ALIVE, DEFAULT_KEEP_ALIVE),
+        )
+        self._entry = entry
+        self._entry_id = entry.entry_id
+        self._options = dict(entry.options)
+        self._poll_lock = asyncio.Lock()
+        self._unsub_poll_tick = None
+        self._rediscovery_lock = asyncio.Lock()
+        self._unsub_rediscovery = None
+        self._cache = FoxDeviceCache(hass, entry.entry_id)
+        self.cache_restored = False
+        self.__devices: dict[str, FoxBaseDevice] = {}
+        self.__devices_map: dict[str, dict[str, FoxBaseDevice]] = {
+            SUPPORTED_PLATFORM_COVER: {},
+            SUPPORTED_PLATFORM_GATE: {},
+            SUPPORTED_PLATFORM_LIGHT: {},
+            SUPPORTED_PLATFORM_SENSOR: {},
+            SUPPORTED_PLATFORM_SWITCH: {},
         }
+        self.metering_coordinator = DataUpdateCoordinator(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_{SUPPORTED_PLATFORM_SENSOR}",
+            update_method=self.async_fetch_sensor_devices,
+            update_interval=timedelta(seconds=get_option(
+                entry, SCHEMA_INPUT_METERING_INTERVAL, METERING_INTERVAL)),
+        )
 
-    def add_device_by_config(self, device_data: DeviceData):
-        """Add device to map with proper platform."""
+    def add_device_by_config(self, device_data: DeviceData) -> FoxBaseDevice | None:
+        """Add device to registry and platform views.
+
+        Return: added device or None if device is skipped or unsupported.
+        """
         #Should skip config
         if device_data.skip is True:
-            return
+            return None
         try:
-            if DEVICES[device_data.dev_type] == DEVICE_MODEL_LED2S2:
-                self.__devices_map[DEVICE_PLATFORM[device_data.dev_type]].append(
-                    FoxLED2S2Device(device_data)
-                )
-            elif DEVICES[device_data.dev_type] == DEVICE_MODEL_DIM1S2:
-                self.__devices_map[DEVICE_PLATFORM[device_data.dev_type]].append(
-                    FoxDIM1S2Device(device_data)
-                )
-            elif DEVICES[device_data.dev_type] == DEVICE_MODEL_RGBW:
-                self.__devices_map[DEVICE_PLATFORM[device_data.dev_type]].append(
-                    FoxRGBWDevice(device_data)
-                )
-            elif DEVICES[device_data.dev_type] == DEVICE_MODEL_R1S1:
-                self.__devices_map[DEVICE_PLATFORM[device_data.dev_type]].append(
-                    FoxR1S1Device(device_data)
-                )
-            elif DEVICES[device_data.dev_type] == DEVICE_MODEL_R2S2:
-                self.__devices_map[DEVICE_PLATFORM[device_data.dev_type]].append(
-                    FoxR2S2Device(device_data)
-                )
-            elif DEVICES[device_data.dev_type] == DEVICE_MODEL_STR1S2:
-                self.__devices_map[DEVICE_PLATFORM[device_data.dev_type]].append(
-                    FoxSTR1S2Device(device_data)
-                )
+            device_model = DEVICES[device_data.dev_type]
+            if device_model == DEVICE_MODEL_LED2S2:
+                device = FoxLED2S2Device(device_data)
+            elif device_model == DEVICE_MODEL_DIM1S2:
+                device = FoxDIM1S2Device(device_data)
+            elif device_model == DEVICE_MODEL_RGBW:
+                device = FoxRGBWDevice(device_data)
+            elif device_model == DEVICE_MODEL_R1S1:
+                device = FoxR1S1Device(device_data)
+            elif device_model == DEVICE_MODEL_R2S2:
+                device = FoxR2S2Device(device_data)
+            elif device_model == DEVICE_MODEL_STR1S2:
+                device = FoxSTR1S2Device(device_data)
+            else:
+                return None
+            attach_client_session(device, self._session)
+            self.__devices[device.mac_addr] = device
+            self.__devices_map[DEVICE_PLATFORM[device_data.dev_type]][device.mac_addr] = device
+            #Energy meter devices are indexed once, not filtered on every poll
+            if isinstance(device, FoxR1S1Device):
+                self.__devices_map[SUPPORTED_PLATFORM_SENSOR][device.mac_addr] = device
+            return device
         except KeyError:
             _LOGGER.error("Unsupported F&F Fox device type.")
+        return None
 
-    @Throttle(THROTTLE_TIME)
-    async def async_fetch_light_devices(self):
-        """Get light device list."""
-        # First call update method for each device
-        await asyncio.gather(
-            *(
-                light.async_fetch_device_available_data()
-                for light in self.__devices_map[SUPPORTED_PLATFORM_LIGHT]
+    async def async_add_device_by_config(self, device_data: DeviceData):
+        """Add device to running integration and create its entities."""
+        device = self.add_device_by_config(device_data)
+        if device is None:
+            return
+        await self._async_fetch_device(device)
+        for platform, platform_devices in self.__devices_map.items():
+            if device.mac_addr in platform_devices:
+                async_dispatcher_send(
+                    self.hass, SIGNAL_DEVICE_ADDED.format(self._entry_id, platform), device
+                )
+
+    @callback
+    def async_remove_device(self, mac_addr: str):
+        """Remove device from running integration with its entities."""
+        if self.__devices.pop(mac_addr, None) is None:
+            return
+        for platform_devices in self.__devices_map.values():
+            platform_devices.pop(mac_addr, None)
+        self._poll_scheduler.remove(mac_addr)
+        self._health.remove(mac_addr)
+        self._poll_holds.pop(mac_addr, None)
+        self._fetched_at.pop(mac_addr, None)
+        self._commanded_at.pop(mac_addr, None)
+        self._request_gates.pop(mac_addr, None)
+        self.metrics.remove(mac_addr)
+        if self._change_probe is not None:
+            self._change_probe.remove(mac_addr)
+        if self.meter_aggregator is not None:
+            self.meter_aggregator.remove(mac_addr)
+        unsub = self._meter_fetches.pop(mac_addr, None)
+        if unsub is not None:
+            unsub()
+        for tasks in (self._confirm_tasks, self._probe_tasks):
+            task = tasks.pop(mac_addr, None)
+            if task is not None:
+                task.cancel()
+        async_dispatcher_send(self.hass, SIGNAL_DEVICE_REMOVED.format(mac_addr))
+
+    @callback
+    def async_apply_options(self, entry: ConfigEntry) -> bool:
+        """Apply changed options to running coordinator.
+
+        Return: False if changed options require entry reload.
+        """
+        changed = {
+            key
+            for key in set(entry.options) | set(self._options)
+            if entry.options.get(key) != self._options.get(key)
+        }
+        if changed & RELOAD_OPTIONS:
+            return False
+        self._options = dict(entry.options)
+        self.async_schedule_polling(entry)
+        self._metering_spread = get_option(
+            entry, SCHEMA_INPUT_METERING_INTERVAL, METERING_INTERVAL) / 2
+        self.metrics.interval = get_pooling_interval(entry).total_seconds()
+        self._poll_scheduler.set_intervals(
+            get_pooling_interval(entry).total_seconds(),
+            get_option(entry, SCHEMA_INPUT_MAX_POOLING, MAX_POOLING_INTERVAL),
+        )
+        self.metering_coordinator.update_interval = timedelta(seconds=get_option(
+            entry, SCHEMA_INPUT_METERING_INTERVAL, METERING_INTERVAL))
+        if SCHEMA_INPUT_MAX_CONCURRENCY in changed:
+            #Requests in progress release old semaphores
+            max_concurrency = get_option(
+                entry, SCHEMA_INPUT_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
             )
+            self._fetch_semaphore = asyncio.Semaphore(max_concurrency)
+            self._command_semaphore = asyncio.Semaphore(max_concurrency)
+        self._device_timeout = get_option(
+            entry, SCHEMA_INPUT_DEVICE_TIMEOUT, DEFAULT_DEVICE_TIMEOUT
+        )
+        self.optimistic = get_option(entry, SCHEMA_INPUT_OPTIMISTIC, DEFAULT_OPTIMISTIC)
+        if changed & {SCHEMA_INPUT_PROBE_POLLING, SCHEMA_INPUT_FULL_REFRESH_INTERVAL}:
+            self._change_probe = create_change_probe(entry)
+        if SCHEMA_INPUT_REDISCOVERY_INTERVAL in changed:
+            self.async_schedule_rediscovery(entry)
+        return True
+
+    @callback
+    def async_schedule_polling(self, entry: ConfigEntry):
+        """Schedule phase slot timer polling devices due in every slot.
+
+        Every device is polled once per polling interval in its slot.
+        """
+        if self._unsub_poll_tick is not None:
+            self._unsub_poll_tick()
+        self._unsub_poll_tick = async_track_time_interval(
+            self.hass, self._async_poll_tick, get_poll_tick(entry)
         )
 
-    @Throttle(THROTTLE_TIME)
-    async def async_fetch_switch_devices(self):
-        """Get all switch devices."""
-        await asyncio.gather(
+    async def _async_poll_tick(self, now):
+        """Poll devices due in current slot, push data only if some changed."""
+        #Slot is skipped while previous one still waits for slow devices
+        if self._poll_lock.locked():
+            return
+        async with self._poll_lock:
+            if await self._async_poll_due_devices():
+                self.async_update_listeners()
+
+    @callback
+    def async_schedule_rediscovery(self, entry: ConfigEntry):
+        """Schedule periodic re-discovery configured in entry options."""
+        if self._unsub_rediscovery is not None:
+            self._unsub_rediscovery()
+            self._unsub_rediscovery = None
+        interval = get_option(
+            entry, SCHEMA_INPUT_REDISCOVERY_INTERVAL, DEFAULT_REDISCOVERY_INTERVAL
+        )
+        if interval > 0:
+            self._unsub_rediscovery = async_track_time_interval(
+                self.hass, self._async_rediscover_interval, timedelta(seconds=interval)
+            )
+
+    async def _async_rediscover_interval(self, now):
+        """Run periodic re-discovery."""
+        await self.async_rediscover()
+
+    async def async_rediscover(self, remove_missing: bool = False):
+        """Discover devices, add new ones and optionally remove missing ones.
+
+        Only new devices working with default API key can be added, with
+        many entries only by entry which has devices in the same subnet.
+        Entry data is updated, running devices are not reloaded.
+
+        Keyword arguments:
+        remove_missing -- remove devices which were not discovered and are
+            unavailable, only on explicit request, never periodically.
+        """
+        #Explicit removal waits for running re-discovery
+        if self._rediscovery_lock.locked() and not remove_missing:
+            return
+        async with self._rediscovery_lock:
+            engine = await async_shared_discover(self.hass)
+            discovered = {
+                device_data.mac_addr: device_data
+                for device_data in engine.get_discovered_devices()
+            }
+            #Entries update their data without awaiting, so every entry
+            #sees devices adopted by entries processed before it
+            entries = self.hass.config_entries.async_entries(DOMAIN)
+            known_mac_addrs = {
+                device_config["mac_addr"]
+                for entry in entries
+                for device_config in entry.data["discovered_devices"]
+            }
+            configs = {
+                device_config["mac_addr"]: device_config
+                for device_config in self._entry.data["discovered_devices"]
+            }
+            site_networks = {
+                get_site_network(device_config["host"]) for device_config in configs.values()
+            }
+            added = []
+            for mac_addr, device_data in discovered.items():
+                if mac_addr in known_mac_addrs:
+                    continue
+                #With many sites device belongs to entry of its subnet
+                if len(entries) > 1 and get_site_network(device_data.host) not in site_networks:
+                    continue
+                if engine.is_api_key_valid(device_data) is not True:
+                    _LOGGER.info(
+                        "Discovered F&F Fox device %s requires RestAPI key, add it in configuration flow.",
+                        device_data.host,
+                    )
+                    continue
+                configs[mac_addr] = device_data.__dict__
+                added.append(device_data)
+            removed = []
+            if remove_missing:
+                for mac_addr in list(configs):
+                    device = self.get_device(mac_addr)
+                    if mac_addr in discovered or (device is not None and device.is_available):
+                        continue
+                    configs.pop(mac_addr)
+                    removed.append(mac_addr)
+            if not added and not removed:
+                return
+            _LOGGER.info("F&F Fox devices added: %s, removed: %s", len(added), len(removed))
+            self.hass.config_entries.async_update_entry(
+                self._entry,
+                data={**self._entry.data, "discovered_devices": list(configs.values())},
+            )
+            for mac_addr in removed:
+                self._async_remove_registry_device(mac_addr)
+                self.async_remove_device(mac_addr)
+            await asyncio.gather(
+                *(self.async_add_device_by_config(device_data) for device_data in added)
+            )
+            self._cache.async_schedule_save(self.get_all_devices)
+
+    @callback
+    def _async_remove_registry_device(self, mac_addr: str):
+        """Remove device with its entities from Home Assistant registry."""
+        device = self.get_device(mac_addr)
+        if device is None:
+            return
+        registry = device_registry.async_get(self.hass)
+        registry_device = registry.async_get_device(
+            {(device.device_platform, mac_addr)}
+        )
+        if registry_device is not None:
+            registry.async_remove_device(registry_device.id)
+
+    @callback
+    def async_setup_platform(
+        self, entry: ConfigEntry, platform: str, async_add_entities, create_entities
+    ):
+        """Add entities of platform devices, also devices added later.
+
+        Keyword arguments:
+        create_entities -- function returning entities list for given device.
+        """
+        entities = []
+        for device in self.__devices_map[platform].values():
+            entities += create_entities(device)
+        async_add_entities(entities)
+
+        @callback
+        def async_add_device_entities(device: FoxBaseDevice):
+            async_add_entities(create_entities(device))
+
+        entry.async_on_unload(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_DEVICE_ADDED.format(entry.entry_id, platform),
+                async_add_device_entities,
+            )
+        )
+
+    async def _async_update_data(self):
+        """Fetch data of due devices, new devices are due right away."""
+        await self._async_poll_due_devices()
+        return self.__devices_map
+
+    async def _async_poll_due_devices(self) -> bool:
+        """Poll devices due now.
+
+        Return: True if state of any polled device changed.
+        """
+        now = monotonic()
+        polled_devices = []
+        for device in self.get_all_devices():
+            if self._health.is_open(device.mac_addr):
+                if self._health.is_probe_due(device.mac_addr, now):
+                    self._async_start_probe(device)
+            elif self._poll_holds.get(device.mac_addr, 0) > now:
+                #State is estimated locally, e.g. moving cover
+                continue
+            elif self._poll_scheduler.is_due(device.mac_addr, now):
+                polled_devices.append(device)
+        changed = await asyncio.gather(
             *(
-                switch.async_fetch_device_available_data()
-                for switch in self.__devices_map[SUPPORTED_PLATFORM_SWITCH]
+                self._async_poll_device(device, probe=True, priority=PRIORITY_POLL)
+                for device in polled_devices
             )
         )
+        self.metrics.record_slot(monotonic() - now, len(polled_devices))
+        if not any(changed):
+            return False
+        self._cache.async_schedule_save(self.get_all_devices)
+        return True
+
+    async def _async_poll_device(
+        self, device, probe: bool = False, priority: int = PRIORITY_CONFIRM
+    ) -> bool:
+        """Poll device and adapt its polling interval to state changes.
+
+        Keyword arguments:
+        probe -- fetch full state only if change probe detects change.
+        priority -- request priority, see DeviceRequestGate.
+
+        Return: True if device state changed.
+        """
+        previous_snapshot = get_device_snapshot(device)
+        change_probe = self._change_probe
+        fetched = full_fetch = True
+        if change_probe is not None and probe:
+            fetched = await self._async_fetch_device(
+                device, change_probe.async_probe, priority
+            )
+            full_fetch = fetched and change_probe.needs_full_fetch(device.mac_addr)
+        if full_fetch:
+            fetched = await self._async_fetch_device(device, priority=priority)
+            if fetched is not None and change_probe is not None:
+                change_probe.record_full_fetch(device.mac_addr)
+        if fetched is None:
+            #Skipped for command, device is back at fast polling
+            return False
+        changed = get_device_snapshot(device) != previous_snapshot
+        self._poll_scheduler.update(device.mac_addr, changed)
+        return changed
+
+    async def async_restore_cache(self) -> bool:
+        """Restore last known devices info and state from cache.
+
+        Return: True if all devices were restored.
+        """
+        self.cache_restored = await self._cache.async_restore(self.get_all_devices())
+        return self.cache_restored
+
+    @callback
+    def _async_start_probe(self, device):
+        """Probe device with open circuit in background."""
+        task = self._probe_tasks.get(device.mac_addr)
+        if task is None or task.done():
+            self._probe_tasks[device.mac_addr] = self.hass.async_create_task(
+                self._async_probe_device(device)
+            )
+
+    async def _async_probe_device(self, device):
+        """Check with single request if failing device is back."""
+        if await self._async_fetch_device(
+            device, type(device).async_fetch_device_info, PRIORITY_POLL
+        ):
+            _LOGGER.info("F&F Fox device %s is back online.", device.mac_addr)
+            #Full fetch in next cycle
+            self._poll_scheduler.mark_active(device.mac_addr)
+
+    def mark_device_active(self, device):
+        """Switch device back to fast polling after command was sent."""
+        self._poll_scheduler.mark_active(device.mac_addr)
+
+    def get_last_fetch_time(self, device) -> float:
+        """Return monotonic start time of last full fetch of device."""
+        return self._fetched_at.get(device.mac_addr, 0.0)
+
+    def get_last_command_time(self, device) -> float:
+        """Return monotonic time when last command was sent to device."""
+        return self._commanded_at.get(device.mac_addr, 0.0)
+
+    def hold_device_polling(self, device, until: float):
+        """Skip device in regular cycles until given monotonic time."""
+        self._poll_holds[device.mac_addr] = until
+
+    @callback
+    def async_schedule_device_refresh(self, device, delay: float = CONFIRM_REFRESH_DELAY):
+        """Schedule refresh of single device confirming sent command.
+
+        Commands sent in short window are confirmed by one refresh.
+        """
+        task = self._confirm_tasks.get(device.mac_addr)
+        if task is not None and not task.done():
+            task.cancel()
+        self._confirm_tasks[device.mac_addr] = self.hass.async_create_task(
+            self._async_confirm_device(device, delay)
+        )
+
+    async def async_refresh_devices(self, mac_addrs):
+        """Pull state of devices signalled as changed and push it to entities."""
+        devices = [
+            device
+            for device in map(self.get_device, mac_addrs)
+            if device is not None
+        ]
+        for device in devices:
+            self.mark_device_active(device)
+        changed = await asyncio.gather(
+            *(self._async_poll_device(device) for device in devices)
+        )
+        if any(changed):
+            self._cache.async_schedule_save(self.get_all_devices)
+        self.async_update_listeners()
+
+    async def _async_confirm_device(self, device, delay: float):
+        """Refresh single device and push its state to entities."""
+        await asyncio.sleep(delay)
+        if await self._async_poll_device(device):
+            self._cache.async_schedule_save(self.get_all_devices)
+        self.async_update_listeners()
 
-    @Throttle(THROTTLE_TIME)
-    async def async_fetch_cover_devices(self):
-        """Get all covers devices."""
-        await asyncio.gather(
+    async def async_fetch_sensor_devices(self):
+        """Fetch energy meter readings of sensor devices.
+
+        First refresh fetches all meters right away. Later refreshes only
+        schedule every meter fetch at its phase within first half of
+        metering interval, refresh does not wait for them.
+        """
+        devices = [
+            device
+            for device in self.get_sensor_devices()
+            if not self._health.is_open(device.mac_addr)
+        ]
+        if self.metering_coordinator.data is None:
+            await asyncio.gather(
+                *(self._async_fetch_meter_device(device) for device in devices)
+            )
+        else:
+            for device in devices:
+                self._schedule_meter_fetch(device)
+        return self.get_sensor_devices()
+
+    @callback
+    def _schedule_meter_fetch(self, device):
+        """Schedule energy meter fetch at device phase."""
+        unsub = self._meter_fetches.pop(device.mac_addr, None)
+        if unsub is not None:
+            unsub()
+
+        @callback
+        def async_fetch_meter(now):
+            self._meter_fetches.pop(device.mac_addr, None)
+            self.hass.async_create_task(self._async_fetch_meter_device(device, True))
+
+        self._meter_fetches[device.mac_addr] = async_call_later(
+            self.hass, get_phase(device.mac_addr) * self._metering_spread, async_fetch_meter
+        )
+
+    async def _async_fetch_meter_device(self, device, notify: bool = False):
+        """Fetch energy meter readings and add them to aggregator.
+
+        Keyword arguments:
+        notify -- push readings to sensor entities.
+        """
+        await self._async_fetch_device(device, async_fetch_meter_data, PRIORITY_POLL)
+        if self.meter_aggregator is not None and device.is_available:
+            self.meter_aggregator.add_sample(device.mac_addr, device.all_sensor_values)
+        if notify:
+            self.metering_coordinator.async_update_listeners()
+
+    async def _async_fetch_device(
+        self, device, fetch_method=None, priority: int = PRIORITY_CONFIRM
+    ) -> bool | None:
+        """Fetch single device data within concurrency cap and deadline.
+
+        Return: True if device is available, None if fetch was skipped
+            for command sent to device.
+        """
+        full_fetch = fetch_method is None
+        if full_fetch:
+            fetch_method = self._get_fetch_method(device)
+        gate = self._get_request_gate(device)
+        #Device turn is taken only with free slot, so queued poll does not
+        #hold device while it waits for other devices
+        with self.metrics.queued():
+            async with self._fetch_semaphore:
+                if not await gate.async_acquire(priority):
+                    return None
+                started = monotonic()
+                try:
+                    await asyncio.wait_for(fetch_method(device), self._device_timeout)
+                except asyncio.TimeoutError:
+                    _LOGGER.warning(
+                        "F&F Fox device %s did not respond in %s s.",
+                        device.mac_addr,
+                        self._device_timeout,
+                    )
+                    #Stale data, mark device as unavailable until next cycle
+                    device.is_available = False
+                except DEVICE_FETCH_ERRORS as error:
+                    _LOGGER.warning(
+                        "F&F Fox device %s request failed: %s", device.mac_addr, error
+                    )
+                    device.is_available = False
+                finally:
+                    gate.release()
+                latency = monotonic() - started
+        if full_fetch:
+            self._fetched_at[device.mac_addr] = started
+        #Regular and background polls run with poll priority
+        if fetch_method is async_fetch_meter_data:
+            kind = REQUEST_METERING
+        elif priority == PRIORITY_POLL:
+            kind = REQUEST_POLL
+        else:
+            kind = REQUEST_REFRESH
+        self.metrics.record(
+            device.mac_addr,
+            fetch_method.__name__.replace("async_", "", 1),
+            latency,
+            device.is_available,
+            kind,
+        )
+        if device.is_available:
+            self._health.record_success(device.mac_addr, latency)
+        else:
+            self._health.record_failure(device.mac_addr)
+        return device.is_available
+
+    async def async_bulk_set(self, targets: list) -> dict[str, str]:
+        """Set state of many channels at once.
+
+        Only channels which cached state differs are sent, concurrently
+        within concurrency cap.
+
+        Keyword arguments:
+        targets -- list of (key, mac_addr, channel, state) tuples,
+            for covers state True means open.
+
+        Return: result by target key.
+        """
+        results = {}
+        commands = []
+        for key, mac_addr, channel, state in targets:
+            device = self.get_device(mac_addr)
+            if device is None:
+                results[key] = BULK_RESULT_NOT_FOUND
+            elif get_channel_state(device, channel) is state:
+                results[key] = BULK_RESULT_UNCHANGED
+            else:
+                commands.append((key, device, channel, state))
+        sent = await asyncio.gather(
             *(
-                cover.async_fetch_device_available_data()
-                for cover in self.__devices_map[SUPPORTED_PLATFORM_COVER]
+                self._async_send_state(device, channel, state)
+                for _, device, channel, state in commands
             )
         )
+        for (key, device, _, _), success in zip(commands, sent):
+            results[key] = BULK_RESULT_CHANGED if success else BULK_RESULT_FAILED
+            self.mark_device_active(device)
+            self.async_schedule_device_refresh(device)
+        return results
+
+    async def _async_send_state(self, device, channel, state: bool) -> bool:
+        """Send channel state within concurrency cap and deadline."""
+        async with self._command_semaphore:
+            #Command is created only when it can be sent
+            if isinstance(device, FoxSTR1S2Device):
+                if state:
+                    operation, command = "open_cover", device.async_open_cover()
+                else:
+                    operation, command = "close_cover", device.async_close_cover()
+            else:
+                operation = "update_channel_state"
+                command = device.async_update_channel_state(state, channel)
+            try:
+                return await asyncio.wait_for(
+                    self.async_send_command(device, operation, command),
+                    self._device_timeout,
+                )
+            except asyncio.TimeoutError:
+                _LOGGER.warning(
+                    "F&F Fox device %s did not respond in %s s.",
+                    device.mac_addr,
+                    self._device_timeout,
+                )
+        return False
+
+    async def async_send_command(self, device, operation: str, request):
+        """Send command to device ahead of its queued polls.
+
+        Keyword arguments:
+        operation -- operation name recorded in metrics.
+        request -- not awaited device command coroutine.
+        """
+        gate = self._get_request_gate(device)
+        try:
+            await gate.async_acquire(PRIORITY_COMMAND)
+        except asyncio.CancelledError:
+            request.close()
+            raise
+        #Device turn is held, fetches started later see result of command
+        self._commanded_at[device.mac_addr] = monotonic()
+        try:
+            return await self.metrics.async_measure(device.mac_addr, operation, request)
+        finally:
+            gate.release()
+
+    def _get_request_gate(self, device) -> DeviceRequestGate:
+        """Get request queue of device."""
+        return self._request_gates.setdefault(device.mac_addr, DeviceRequestGate())
+
+    @staticmethod
+    def _get_fetch_method(device):
+        """Return method used to fetch device in regular cycle."""
+        if isinstance(device, FoxR1S1Device):
+            return async_fetch_relay_state
+        return type(device).async_fetch_device_available_data
+
+    def get_diagnostics(self) -> dict:
+        """Return diagnostics data of all devices."""
+        return {
+            device.mac_addr: {
+                "model": DEVICES[device.dev_type],
+                "available": device.is_available,
+                "poll_interval": self._poll_scheduler.get_interval(device.mac_addr),
+                "health": self._health.get(device.mac_addr).as_dict(),
+                "metrics": self.metrics.get_device_dict(device.mac_addr),
+            }
+            for device in self.get_all_devices()
+        }
+
+    def get_device_health(self, mac_addr: str) -> DeviceHealth:
+        """Get health of device."""
+        return self._health.get(mac_addr)
+
+    async def async_close(self):
+        """Cancel pending refreshes and close connection pool."""
+        if self._unsub_poll_tick is not None:
+            self._unsub_poll_tick()
+        if self._unsub_rediscovery is not None:
+            self._unsub_rediscovery()
+        for unsub in self._meter_fetches.values():
+            unsub()
+        for task in (*self._confirm_tasks.values(), *self._probe_tasks.values()):
+            task.cancel()
+        await self._session.close()
+
+    def get_all_devices(self) -> list:
+        """Get devices from all platforms."""
+        return list(self.__devices.values())
+
+    def get_device(self, mac_addr: str) -> FoxBaseDevice | None:
+        """Get device by MAC address."""
+        return self.__devices.get(mac_addr)
 
-    def get_cover_devices(self):
+    def get_cover_devices(self) -> list:
         """Get cover devices."""
-        return self.__devices_map[SUPPORTED_PLATFORM_COVER]
+        return list(self.__devices_map[SUPPORTED_PLATFORM_COVER].values())
 
-    def get_light_devices(self):
+    def get_light_devices(self) -> list:
         """Get light devices."""
-        return self.__devices_map[SUPPORTED_PLATFORM_LIGHT]
+        return list(self.__devices_map[SUPPORTED_PLATFORM_LIGHT].values())
 
-    def get_switch_devices(self):
+    def get_switch_devices(self) -> list:
         """Get switch devices."""
-        return self.__devices_map[SUPPORTED_PLATFORM_SWITCH]
+        return list(self.__devices_map[SUPPORTED_PLATFORM_SWITCH].values())
 
-    def get_sensor_devices(self):
+    def get_sensor_devices(self) -> list:
         """Get sensor devices."""
-        sensors = []
-        for switch in self.__devices_map[SUPPORTED_PLATFORM_SWITCH]:
-            if isinstance(switch, FoxR1S1Device):
-                sensors.append(switch)
-        return sensors
+        return list(self.__devices_map[SUPPORTED_PLATFORM_SENSOR].values())
@@ -0,0 +1,113 @@
+"""Downsampling of R1S1 energy meter readings."""
+from __future__ import annotations
+
+from array import array
+from time import monotonic
+
+# Instantaneous readings published as window means.
+AGGREGATED_KEYS = (
+    "voltage",
+    "current",
+    "power_active",
+    "power_reactive",
+    "frequency",
+    "power_factor",
+)
+# Active energy (in kWh) integrated from active power samples.
+INTEGRATED_ENERGY_KEY = "integrated_active_energy"
+# Reading integrated into energy.
+INTEGRATED_POWER_KEY = "power_active"
+
+
+class MeterWindow:
+    """Samples of single meter collected in current window."""
+
+    def __init__(self, started: float) -> None:
+        """Initialize object."""
+        self.started = started
+        self.samples = {key: array("d") for key in AGGREGATED_KEYS}
+        self.last_power: tuple[float, float] | None = None
+
+    def clear(self, started: float):
+        """Start next window, buffers are reused."""
+        self.started = started
+        for samples in self.samples.values():
+            del samples[:]
+
+
+class MeterAggregator:
+    """Aggregate meter readings in fixed windows.
+
+    Readings are collected in array buffers and published once per window
+    as mean with min and max, so state machine and recorder get one value
+    per window instead of every sample. Active power is integrated into
+    energy with trapezoidal rule across windows.
+    """
+
+    def __init__(self, window: float) -> None:
+        """Initialize object."""
+        self._window = window
+        self._windows: dict[str, MeterWindow] = {}
+        self._published: dict[str, dict[str, dict[str, float]]] = {}
+        self._energy: dict[str, float] = {}
+
+    def add_sample(self, mac_addr: str, values: dict, now: float | None = None):
+        """Add meter readings, publish aggregates if window elapsed."""
+        if now is None:
+            now = monotonic()
+        window = self._windows.get(mac_addr)
+        if window is None:
+            window = self._windows[mac_addr] = MeterWindow(now)
+        for key, samples in window.samples.items():
+            value = _to_float(values.get(key))
+            if value is not None:
+                samples.append(value)
+        power = _to_float(values.get(INTEGRATED_POWER_KEY))
+        if power is not None:
+            if window.last_power is not None:
+                last_time, last_power = window.last_power
+                self._energy[mac_addr] = self._energy.get(mac_addr, 0.0) + (
+                    (power + last_power) / 2 * (now - last_time) / 3600000
+                )
+            window.last_power = (now, power)
+        #First samples are published right away
+        if mac_addr not in self._published or now - window.started >= self._window:
+            self._publish(mac_addr, window)
+            window.clear(now)
+
+    def _publish(self, mac_addr: str, window: MeterWindow):
+        """Publish aggregates of window samples."""
+        published = self._published.setdefault(mac_addr, {})
+        for key, samples in window.samples.items():
+            if samples:
+                published[key] = {
+                    "mean": sum(samples) / len(samples),
+                    "min": min(samples),
+                    "max": max(samples),
+                }
+        if mac_addr in self._energy:
+            published[INTEGRATED_ENERGY_KEY] = {"mean": self._energy[mac_addr]}
+
+    def get_value(self, mac_addr: str, key: str) -> float | None:
+        """Return published mean of reading."""
+        stats = self._published.get(mac_addr, {}).get(key)
+        return None if stats is None else stats["mean"]
+
+    def get_stats(self, mac_addr: str, key: str) -> dict[str, float]:
+        """Return published min and max of reading."""
+        stats = self._published.get(mac_addr, {}).get(key, {})
+        return {attr: value for attr, value in stats.items() if attr != "mean"}
+
+    def remove(self, mac_addr: str):
+        """Forget device."""
+        self._windows.pop(mac_addr, None)
+        self._published.pop(mac_addr, None)
+        self._energy.pop(mac_addr, None)
+
+
+def _to_float(value) -> float | None:
+    """Return reading as float, None if it is not a number."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,54 @@
+"""Persistent cache of F&F Fox devices info and state."""
+from __future__ import annotations
+
+import logging
+
+from .const import DOMAIN, STORAGE_SAVE_DELAY, STORAGE_VERSION
+from .device_state import dump_device, restore_device
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FoxDeviceCache:
+    """Last known info and state of devices, stored per config entry.
+
+    Lets entities be created at boot without waiting for every device.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize object."""
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+    async def async_restore(self, devices: list) -> bool:
+        """Restore cached data into devices.
+
+        Return: True if every device was restored from cache.
+        """
+        data = await self._store.async_load()
+        if not data:
+            return False
+        restored = True
+        for device in devices:
+            if device.mac_addr not in data:
+                restored = False
+                continue
+            try:
+                restore_device(device, data[device.mac_addr])
+            except (KeyError, TypeError) as error:
+                _LOGGER.warning("Cannot restore F&F Fox device %s: %s", device.mac_addr, error)
+                restored = False
+        return restored
+
+    @callback
+    def async_schedule_save(self, get_devices):
+        """Schedule delayed save, devices are read at write time."""
+        self._store.async_delay_save(
+            lambda: {device.mac_addr: dump_device(device) for device in get_devices()},
+            STORAGE_SAVE_DELAY,
+        )
+
+    async def async_remove(self):
+        """Remove cache file."""
+        await self._store.async_remove()
@@ -0,0 +1,51 @@
+"""Command batching for F&F Fox device channels."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from homeassistant.core import HomeAssistant
+
+# Command key of channel on/off state.
+COMMAND_STATE = "state"
+
+
+class CommandBatcher:
+    """Merge commands sent to one channel in short window.
+
+    Every command is merged into pending one (last write wins) and all
+    callers wait for single send of merged command. Turning channel off
+    drops pending attributes, they would be lost on device anyway.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        async_send_command: Callable[[dict[str, Any]], Awaitable[dict[str, Any]]],
+        delay: float,
+    ) -> None:
+        """Initialize object."""
+        self._hass = hass
+        self._async_send_command = async_send_command
+        self._delay = delay
+        self._pending: dict[str, Any] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    async def async_submit(self, command: dict[str, Any]) -> dict[str, Any]:
+        """Merge command with pending one and wait until it is sent.
+
+        Return: attributes accepted by device.
+        """
+        if command.get(COMMAND_STATE) is False:
+            self._pending.clear()
+        self._pending.update(command)
+        if self._flush_task is None:
+            self._flush_task = self._hass.async_create_task(self._async_flush())
+        return await asyncio.shield(self._flush_task)
+
+    async def _async_flush(self) -> dict[str, Any]:
+        """Send pending command after debounce window."""
+        await asyncio.sleep(self._delay)
+        command, self._pending = self._pending, {}
+        self._flush_task = None
+        return await self._async_send_command(command)
@@ -6,20 +6,46 @@ from typing import Any
 
 from foxrestapiclient.devices.const import DEVICES
 from foxrestapiclient.devices.fox_base_device import DeviceData, FoxBaseDevice
-from foxrestapiclient.devices.fox_service_discovery import FoxServiceDiscovery
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant, callback
 
 from .const import (
+    DEFAULT_DEVICE_TIMEOUT,
+    DEFAULT_DIAGNOSTIC_SENSORS,
+    DEFAULT_KEEP_ALIVE,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_METER_WINDOW,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_PROBE_POLLING,
+    DEFAULT_REDISCOVERY_INTERVAL,
+    DEFAULT_SENSOR_DEADBAND,
     DOMAIN,
+    FULL_REFRESH_INTERVAL,
+    MAX_POOLING_INTERVAL,
+    METERING_INTERVAL,
     POOLING_INTERVAL,
     SCHEMA_INPUT_DEVICE_API_KEY,
     SCHEMA_INPUT_DEVICE_NAME_KEY,
+    SCHEMA_INPUT_DEVICE_TIMEOUT,
+    SCHEMA_INPUT_DIAGNOSTIC_SENSORS,
+    SCHEMA_INPUT_FULL_REFRESH_INTERVAL,
+    SCHEMA_INPUT_KEEP_ALIVE,
+    SCHEMA_INPUT_MAX_CONCURRENCY,
+    SCHEMA_INPUT_MAX_POOLING,
+    SCHEMA_INPUT_METER_WINDOW,
+    SCHEMA_INPUT_METERING_INTERVAL,
+    SCHEMA_INPUT_OPTIMISTIC,
+    SCHEMA_INPUT_POOL_SIZE,
+    SCHEMA_INPUT_PROBE_POLLING,
+    SCHEMA_INPUT_REDISCOVERY_INTERVAL,
+    SCHEMA_INPUT_SENSOR_DEADBAND,
     SCHEMA_INPUT_UPDATE_POOLING,
     SCHEMA_INPUT_SKIP_CONFIG,
 )
+from .discovery import FoxDiscoveryEngine, async_shared_discover
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -99,6 +125,54 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     vol.Required(SCHEMA_INPUT_UPDATE_POOLING,
                         default=("" if SCHEMA_INPUT_UPDATE_POOLING not in self.config_entry.options
                         else str(self.config_entry.options.get(SCHEMA_INPUT_UPDATE_POOLING)))): str,
+                    vol.Required(SCHEMA_INPUT_MAX_POOLING,
+                        default=self.config_entry.options.get(
+                            SCHEMA_INPUT_MAX_POOLING, MAX_POOLING_INTERVAL)):
+                        vol.All(vol.Coerce(float), vol.Range(min=1)),
+                    vol.Required(SCHEMA_INPUT_METERING_INTERVAL,
+                        default=self.config_entry.options.get(
+                            SCHEMA_INPUT_METERING_INTERVAL, METERING_INTERVAL)):
+                        vol.All(vol.Coerce(float), vol.Range(min=1)),
+                    vol.Required(SCHEMA_INPUT_MAX_CONCURRENCY,
+                        default=self.config_entry.options.get(
+                            SCHEMA_INPUT_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)):
+                        vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(SCHEMA_INPUT_DEVICE_TIMEOUT,
+                        default=self.config_entry.options.get(
+                            SCHEMA_INPUT_DEVICE_TIMEOUT, DEFAULT_DEVICE_TIMEOUT)):
+                        vol.All(vol.Coerce(float), vol.Range(min=0.5)),
+                    vol.Required(SCHEMA_INPUT_POOL_SIZE,
+                        default=self.config_entry.options.get(
+                            SCHEMA_INPUT_POOL_SIZE, DEFAULT_POOL_SIZE)):
+                        vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(SCHEMA_INPUT_KEEP_ALIVE,
+                        default=self.config_entry.options.get(
+                            SCHEMA_INPUT_KEEP_ALIVE, DEFAULT_KEEP_ALIVE)):
+                        vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Required(SCHEMA_INPUT_OPTIMISTIC,
+                        default=self.config_entry.options.get(
+                            SCHEMA_INPUT_OPTIMISTIC, DEFAULT_OPTIMISTIC)): bool,
+                    vol.Required(SCHEMA_INPUT_SENSOR_DEADBAND,
+                        default=self.config_entry.options.get(
+                            SCHEMA_INPUT_SENSOR_DEADBAND, DEFAULT_SENSOR_DEADBAND)): bool,
+                    vol.Required(SCHEMA_INPUT_REDISCOVERY_INTERVAL,
+                        default=self.config_entry.options.get(
+                            SCHEMA_INPUT_REDISCOVERY_INTERVAL, DEFAULT_REDISCOVERY_INTERVAL)):
+                        vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Required(SCHEMA_INPUT_DIAGNOSTIC_SENSORS,
+                        default=self.config_entry.options.get(
+                            SCHEMA_INPUT_DIAGNOSTIC_SENSORS, DEFAULT_DIAGNOSTIC_SENSORS)): bool,
+                    vol.Required(SCHEMA_INPUT_PROBE_POLLING,
+                        default=self.config_entry.options.get(
+                            SCHEMA_INPUT_PROBE_POLLING, DEFAULT_PROBE_POLLING)): bool,
+                    vol.Required(SCHEMA_INPUT_FULL_REFRESH_INTERVAL,
+                        default=self.config_entry.options.get(
+                            SCHEMA_INPUT_FULL_REFRESH_INTERVAL, FULL_REFRESH_INTERVAL)):
+                        vol.All(vol.Coerce(float), vol.Range(min=1)),
+                    vol.Required(SCHEMA_INPUT_METER_WINDOW,
+                        default=self.config_entry.options.get(
+                            SCHEMA_INPUT_METER_WINDOW, DEFAULT_METER_WINDOW)):
+                        vol.All(vol.Coerce(float), vol.Range(min=0)),
                 }
             ),
             errors=errors,
@@ -108,8 +182,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Configuration flow."""
 
     VERSION = 2
-    # Fox service discovery object
-    fox_service_discovery = FoxServiceDiscovery()
+    # Fox devices discovery engine, created when flow starts
+    fox_discovery_engine: FoxDiscoveryEngine = None
+
+    def __init__(self) -> None:
+        """Initialize flow, every flow (site) keeps its own progress."""
+        self._devices: list[DeviceData] = []
+        self._device_index = 0
+        self._summary_displayed = False
 
     @staticmethod
     @callback
@@ -119,8 +199,20 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def _async_do_discover_task(self):
         """Do service discovery task."""
 
-        # Discover F&F Fox devices in local network
-        await self.fox_service_discovery.async_discover_devices()
+        # Discover F&F Fox devices in local network and validate default API keys,
+        # discovery is shared with entries re-discovering at the same time
+        self.fox_discovery_engine = await async_shared_discover(self.hass)
+        # Devices configured in other entries (sites) are not offered again
+        configured = {
+            device_config["mac_addr"]
+            for entry in self._async_current_entries()
+            for device_config in entry.data["discovered_devices"]
+        }
+        self._devices = [
+            device
+            for device in self.fox_discovery_engine.get_discovered_devices()
+            if device.mac_addr not in configured
+        ]
 
         # Continue the flow after show progress when the task is done.
         # To avoid a potential deadlock we create a new task that continues the flow.
@@ -132,9 +224,6 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def async_step_user(self, user_input: dict[str, Any] | None = None):
         """Handle the initial step."""
-        # Check it is already configured
-        if self._async_current_entries():
-            return self.async_abort(reason="single_instance_allowed")
         # Do discover task
         self.hass.async_create_task(self._async_do_discover_task())
         return self.async_show_progress(
@@ -152,16 +241,13 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ):
         """Handle the discovering summary."""
         # Get discovered devices
-        devices = self.fox_service_discovery.get_discovered_devices()
+        devices = self._devices
         # There is no devices, abort.
         if len(devices) <= 0:
             return self.async_abort(reason="no_devices_found")
         # If user input is not none, show configuration form.
-        if "summary_displayed" in self.hass.data:
-            self.hass.data.pop("summary_displayed")
-            # Set current device index
-            if "device_index" not in self.hass.data:
-                self.hass.data.update({"device_index": 0})
+        if self._summary_displayed:
+            self._summary_displayed = False
             return self.async_show_form(
                 step_id="configure_device",
                 data_schema=device_input_schema,
@@ -172,7 +258,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     "device_type": DEVICES[devices[0].dev_type]
                 },
             )
-        self.hass.data.update({"summary_displayed": True})
+        self._summary_displayed = True
         return self.async_show_form(
             step_id="discovering_summary",
             description_placeholders={"devices_amount": len(devices)},
@@ -185,40 +271,29 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle configure device step."""
         errors = {}
         if user_input is not None:
-            current_device: DeviceData = (
-                self.fox_service_discovery.get_discovered_devices()[
-                    self.hass.data["device_index"]
-                ]
-            )
+            current_device: DeviceData = self._devices[self._device_index]
             try:
                 current_device.skip = user_input[SCHEMA_INPUT_SKIP_CONFIG]
                 current_device.api_key = user_input[SCHEMA_INPUT_DEVICE_API_KEY]
                 current_device.name = user_input[SCHEMA_INPUT_DEVICE_NAME_KEY]
             except KeyError:
                 _LOGGER.info("Device name was not set. Default will be used.")
-            errors = await validate_input(self.hass, current_device)
+            # Skip request if device was already validated with this key
+            if self.fox_discovery_engine.is_api_key_valid(current_device) is not True:
+                errors = await validate_input(self.hass, current_device)
             if errors == {}:
-                self.hass.data["device_index"] = self.hass.data["device_index"] + 1
+                self._device_index += 1
                 await self.async_set_unique_id(current_device.mac_addr)
 
-        should_finish = len(self.fox_service_discovery.get_discovered_devices()) < (
-            self.hass.data["device_index"] + 1
-        )
+        should_finish = len(self._devices) < self._device_index + 1
         if should_finish is True:
-            self.hass.data.pop("device_index")
             return self.async_create_entry(
                 title="F&F Fox",
-                data=await serialize_dicovered_devices(
-                    self.hass, self.fox_service_discovery.get_discovered_devices()
-                ),
+                data=await serialize_dicovered_devices(self.hass, self._devices),
             )
-        is_last_step = len(self.fox_service_discovery.get_discovered_devices()) == (
-            self.hass.data["device_index"] + 1
-        )
+        is_last_step = len(self._devices) == self._device_index + 1
         # Get next device to fill placeholders data
-        next_device = self.fox_service_discovery.get_discovered_devices()[
-            self.hass.data["device_index"]
-        ]
+        next_device = self._devices[self._device_index]
         return self.async_show_form(
             step_id="configure_device",
             data_schema=device_input_schema,
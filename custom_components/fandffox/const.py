@@ -2,11 +2,100 @@
 
 DOMAIN = "fandffox"
 
+# Dispatcher signals, formatted with entry id and platform or MAC address.
+SIGNAL_DEVICE_ADDED = "fandffox_device_added_{}_{}"
+SIGNAL_DEVICE_REMOVED = "fandffox_device_removed_{}"
+
+SERVICE_BULK_SET = "bulk_set"
+SERVICE_REDISCOVER = "rediscover"
+SERVICE_REFRESH = "refresh"
+EVENT_BULK_SET_RESULT = "fandffox_bulk_set_result"
+
+# Bulk set results per target.
+BULK_RESULT_CHANGED = "changed"
+BULK_RESULT_UNCHANGED = "unchanged"
+BULK_RESULT_FAILED = "failed"
+BULK_RESULT_NOT_FOUND = "not_found"
+
 SCHEMA_INPUT_DEVICE_NAME_KEY = "device_name"
 SCHEMA_INPUT_DEVICE_API_KEY = "rest_api_key"
 SCHEMA_INPUT_SKIP_CONFIG = "skip_config"
 SCHEMA_INPUT_UPDATE_POOLING = "pooling"
+SCHEMA_INPUT_MAX_CONCURRENCY = "max_concurrency"
+SCHEMA_INPUT_DEVICE_TIMEOUT = "device_timeout"
+SCHEMA_INPUT_POOL_SIZE = "pool_size"
+SCHEMA_INPUT_KEEP_ALIVE = "keep_alive"
+SCHEMA_INPUT_METERING_INTERVAL = "metering_interval"
+SCHEMA_INPUT_MAX_POOLING = "max_pooling"
+SCHEMA_INPUT_OPTIMISTIC = "optimistic"
+SCHEMA_INPUT_SENSOR_DEADBAND = "sensor_deadband"
+SCHEMA_INPUT_REDISCOVERY_INTERVAL = "rediscovery_interval"
+SCHEMA_INPUT_DIAGNOSTIC_SENSORS = "diagnostic_sensors"
+SCHEMA_INPUT_PROBE_POLLING = "probe_polling"
+SCHEMA_INPUT_METER_WINDOW = "meter_window"
+SCHEMA_INPUT_FULL_REFRESH_INTERVAL = "full_refresh_interval"
 
-# Default timeout (in seconds) used in all coordinators.
-DEFAULT_COORDINATOR_TIMEOUT = 30
 POOLING_INTERVAL = 5
+# Polling interval is split into so many phase slots, devices are spread among them.
+POLL_PHASE_SLOTS = 5
+# Minimal time (in seconds) between phase slots.
+MIN_POLL_TICK = 1
+# Ceiling (in seconds) of adaptive polling interval for idle devices.
+MAX_POOLING_INTERVAL = 60
+# Energy meter readings refresh interval (in seconds).
+METERING_INTERVAL = 30
+# Maximum number of devices fetched at the same time.
+DEFAULT_MAX_CONCURRENCY = 8
+# Deadline (in seconds) for a single device fetch.
+DEFAULT_DEVICE_TIMEOUT = 4
+# HTTP connection pool shared by all devices.
+DEFAULT_POOL_SIZE = 16
+DEFAULT_KEEP_ALIVE = 30
+# Fox modules handle only few simultaneous connections.
+POOL_LIMIT_PER_HOST = 2
+# Show expected state right after command is sent.
+DEFAULT_OPTIMISTIC = True
+# Delay (in seconds) of device refresh confirming sent command.
+CONFIRM_REFRESH_DELAY = 1
+# Initial time (in seconds) of full cover travel, calibrated later.
+COVER_TRAVEL_TIME = 30
+# Interval (in seconds) of estimated position updates while cover moves.
+COVER_UPDATE_INTERVAL = 1
+# Follow-up polls of cover which did not reach target at predicted end.
+COVER_MAX_FOLLOW_UPS = 3
+# Window (in seconds) in which light commands are merged into one.
+COMMAND_DEBOUNCE_DELAY = 0.15
+# Ignore small changes of analog sensor values.
+DEFAULT_SENSOR_DEADBAND = False
+# Minimal change of analog sensor value written to state machine.
+SENSOR_DEADBANDS = {
+    "voltage": 0.5,
+    "current": 0.01,
+    "power_active": 1,
+    "power_reactive": 1,
+    "frequency": 0.05,
+}
+# Discovery tuning: parallel probes, probe timeout (in seconds),
+# broadcast rounds (4 seconds each) and probe start interval (in seconds).
+DISCOVERY_MAX_PARALLEL = 16
+DISCOVERY_PROBE_TIMEOUT = 5
+DISCOVERY_TRIES = 5
+DISCOVERY_POLL_INTERVAL = 0.5
+# Poll cheap change indicator and fetch full state only when it changed.
+DEFAULT_PROBE_POLLING = False
+# Full fetch interval (in seconds) of devices polled with change probe.
+FULL_REFRESH_INTERVAL = 300
+# Energy meter aggregation window (in seconds), 0 publishes raw readings.
+DEFAULT_METER_WINDOW = 0
+# Create latency and error count sensors of every device.
+DEFAULT_DIAGNOSTIC_SENSORS = False
+# Backoff (in seconds) between probes of failing device.
+CIRCUIT_MIN_BACKOFF = 10
+CIRCUIT_MAX_BACKOFF = 600
+# Background re-discovery interval (in seconds), 0 disables it.
+DEFAULT_REDISCOVERY_INTERVAL = 3600
+# hass.data key of discovery shared by all config entries.
+DATA_DISCOVERY_TASK = "fandffox_discovery_task"
+# Devices cache storage.
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30
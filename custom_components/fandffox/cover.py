@@ -3,19 +3,32 @@ from __future__ import annotations
 
 from datetime import timedelta
 import logging
+from time import monotonic
 
 from homeassistant.components.cover import (
+    ATTR_POSITION,
     DEVICE_CLASS_BLIND,
     SUPPORT_CLOSE,
     SUPPORT_OPEN,
+    SUPPORT_SET_POSITION,
+    SUPPORT_STOP,
     CoverEntity,
 )
+from foxrestapiclient.devices.const import SUPPORTED_PLATFORM_COVER
+from foxrestapiclient.devices.fox_str1s2_device import FoxSTR1S2Device
+
 from . import FoxDevicesCoordinator
-from .const import DOMAIN, POOLING_INTERVAL, SCHEMA_INPUT_UPDATE_POOLING
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
+from .const import (
+    CONFIRM_REFRESH_DELAY,
+    COVER_MAX_FOLLOW_UPS,
+    COVER_TRAVEL_TIME,
+    COVER_UPDATE_INTERVAL,
+    DOMAIN,
 )
+from .cover_model import CoverTravelModel
+from .entity import FoxEntity
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,87 +36,182 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up switch entries."""
 
-    device_coordinator: FoxDevicesCoordinator = hass.data[DOMAIN][config_entry.entry_id]
-    entities = []
-
-    async def async_update_data():
-        """Fetch data from API endpoint.
-
-        This is the place to pre-process the data to lookup tables
-        so entities can quickly look up their data.
-        """
-
-        await device_coordinator.async_fetch_cover_devices()
+    coordinator: FoxDevicesCoordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-        return device_coordinator.get_cover_devices()
+    def create_entities(device):
+        return [FoxBaseCover(coordinator, device)]
 
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        # Name of the data. For logging purposes.
-        name="cover",
-        update_method=async_update_data,
-        # Polling interval. Will only be polled if there are subscribers.
-        update_interval=timedelta(seconds=(
-            POOLING_INTERVAL if SCHEMA_INPUT_UPDATE_POOLING not in config_entry.options
-            else config_entry.options.get(SCHEMA_INPUT_UPDATE_POOLING))),
+    coordinator.async_setup_platform(
+        config_entry, SUPPORTED_PLATFORM_COVER, async_add_entities, create_entities
     )
-
-    await coordinator.async_config_entry_first_refresh()
-    for idx, ent in enumerate(coordinator.data):
-        entities.append(FoxBaseCover(coordinator, idx))
-    async_add_entities(entities)
     return True
 
 
-class FoxBaseCover(CoordinatorEntity, CoverEntity):
-    """Fox base cover implementation."""
+class FoxBaseCover(FoxEntity, CoverEntity):
+    """Fox base cover implementation.
 
-    def __init__(self, coordinator: DataUpdateCoordinator, idx: int) -> None:
+    Position is estimated with travel time model while cover moves and
+    device is polled only at predicted movement end.
+    """
+
+    _attr_supported_features = (
+        SUPPORT_OPEN | SUPPORT_CLOSE | SUPPORT_SET_POSITION | SUPPORT_STOP
+    )
+    _attr_device_class = DEVICE_CLASS_BLIND
+
+    def __init__(self, coordinator: FoxDevicesCoordinator, device: FoxSTR1S2Device) -> None:
         """Initialize object."""
-        super().__init__(coordinator)
-        self._idx = idx
+        super().__init__(
+            coordinator,
+            device,
+            f"{device.mac_addr}-{device.device_platform}",
+            device.name,
+        )
+        self._travel = CoverTravelModel(COVER_TRAVEL_TIME)
+        self._follow_ups = 0
+        self._finish_at = 0.0
+        self._unsub_tick = None
 
     @property
-    def name(self):
-        """Return the name of the device."""
-        return self.coordinator.data[self._idx].name
+    def _is_estimated(self) -> bool:
+        """Return True if estimated position is shown."""
+        return self._travel.is_moving and self.coordinator.optimistic
 
     @property
-    def available(self):
-        """Return True if entity is available."""
-        return self.coordinator.data[self._idx].is_available
+    def current_cover_position(self) -> int | None:
+        """Return estimated position while moving, reported one otherwise."""
+        if self._is_estimated:
+            return self._travel.get_position()
+        return self._device.get_cover_position()
 
     @property
-    def unique_id(self) -> str:
-        """Return a unique ID."""
-        device = self.coordinator.data[self._idx]
-        return f"{device.mac_addr}-{device.device_platform}"
+    def is_closed(self) -> bool | None:
+        """Return is closed."""
+        return self.current_cover_position == 0
 
     @property
-    def device_info(self):
-        """Return device info."""
-        return self.coordinator.data[self._idx].get_device_info()
+    def is_opening(self) -> bool:
+        """Return is opening."""
+        return self._is_estimated and self._travel.is_opening
 
     @property
-    def supported_features(self):
-        """Return supported features."""
-        return SUPPORT_OPEN | SUPPORT_CLOSE
+    def is_closing(self) -> bool:
+        """Return is closing."""
+        return self._is_estimated and self._travel.is_closing
 
-    @property
-    def device_class(self):
-        """Return device class."""
-        return DEVICE_CLASS_BLIND
+    def _state_snapshot(self) -> tuple:
+        """Return values exposed by entity."""
+        return (self.available, self.current_cover_position, self.is_opening, self.is_closing)
 
-    @property
-    def is_closed(self) -> bool | None:
-        """Return is closed."""
-        return self.coordinator.data[self._idx].is_cover_closed()
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop position updates."""
+        self._async_stop_tick()
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Finish movement when device is polled at its predicted end.
+
+        Listeners are also called after refresh of other devices, movement
+        is finished only by state fetched after predicted end.
+        """
+        if (
+            self._travel.is_moving
+            and self.coordinator.get_last_fetch_time(self._device) >= self._travel.end_time
+        ):
+            self._async_finish_movement()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_finish_movement(self):
+        """Calibrate model with reported position, follow cover still moving."""
+        target = self._travel.target_position
+        start = self._travel.start_position
+        reported = self._device.get_cover_position()
+        if (
+            self._travel.finish(reported)
+            or not self._device.is_available
+            or reported == start
+            or self._follow_ups >= COVER_MAX_FOLLOW_UPS
+        ):
+            self._async_stop_tick()
+            self.coordinator.hold_device_polling(self._device, 0)
+            return
+        self._follow_ups += 1
+        self._async_start_movement(reported, target)
+
+    @callback
+    def _async_start_movement(self, position: int, target: int):
+        """Start estimating movement and poll device at its predicted end."""
+        self._travel.start(position, target)
+        if not self._travel.is_moving:
+            self._async_stop_tick()
+            self.coordinator.hold_device_polling(self._device, 0)
+            self.coordinator.async_schedule_device_refresh(self._device)
+            return
+        self._finish_at = self._travel.end_time + CONFIRM_REFRESH_DELAY
+        self.coordinator.hold_device_polling(self._device, self._finish_at)
+        self.coordinator.async_schedule_device_refresh(
+            self._device, self._finish_at - monotonic()
+        )
+        if self._unsub_tick is None:
+            self._unsub_tick = async_track_time_interval(
+                self.hass, self._async_tick, timedelta(seconds=COVER_UPDATE_INTERVAL)
+            )
+
+    @callback
+    def _async_tick(self, now):
+        """Write estimated position."""
+        if self._is_state_changed(self._state_snapshot()):
+            self.async_write_ha_state()
+
+    @callback
+    def _async_stop_tick(self):
+        """Stop estimated position updates."""
+        if self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+
+    async def _async_move_to(self, target: int, operation: str, command):
+        """Send movement command and estimate position until it ends."""
+        self.coordinator.mark_device_active(self._device)
+        position = self.current_cover_position or 0
+        if await self.coordinator.async_send_command(
+            self._device, operation, command
+        ):
+            self._follow_ups = 0
+            self._async_start_movement(position, target)
+        else:
+            self.coordinator.async_schedule_device_refresh(self._device)
+        self.async_write_ha_state()
 
     async def async_open_cover(self, **kwargs):
         """Open the cover."""
-        await self.coordinator.data[self._idx].async_open_cover()
+        await self._async_move_to(100, "open_cover", self._device.async_open_cover())
 
     async def async_close_cover(self, **kwargs):
         """Close cover."""
-        await self.coordinator.data[self._idx].async_close_cover()
+        await self._async_move_to(0, "close_cover", self._device.async_close_cover())
+
+    async def async_set_cover_position(self, **kwargs):
+        """Move cover to given position."""
+        position = kwargs[ATTR_POSITION]
+        await self._async_move_to(
+            position,
+            "set_cover_position",
+            self._device.async_set_cover_position(position),
+        )
+
+    async def async_stop_cover(self, **kwargs):
+        """Stop cover.
+
+        Device has no stop request, cover is sent to its estimated position.
+        """
+        if not self._travel.is_moving:
+            return
+        position = self._travel.get_position()
+        await self._async_move_to(
+            position,
+            "set_cover_position",
+            self._device.async_set_cover_position(position),
+        )
@@ -0,0 +1,87 @@
+"""Travel time model of STR1S2 cover position."""
+from __future__ import annotations
+
+from time import monotonic
+
+# Weight of newest travel time measurement.
+CALIBRATION_ALPHA = 0.5
+# Travel time correction when cover reached target at predicted end.
+CALIBRATION_SHRINK = 0.95
+
+
+class CoverTravelModel:
+    """Estimate cover position while it is moving.
+
+    Cover is assumed to move with constant speed, full travel (0-100)
+    takes travel_time seconds. Travel time is calibrated with positions
+    reported by device when predicted movement end is polled.
+    """
+
+    def __init__(self, travel_time: float) -> None:
+        """Initialize object."""
+        self.travel_time = travel_time
+        self.start_position = 0
+        self.target_position: int | None = None
+        self._started = 0.0
+
+    @property
+    def is_moving(self) -> bool:
+        """Return True if cover movement is in progress."""
+        return self.target_position is not None
+
+    @property
+    def is_opening(self) -> bool:
+        """Return True if cover is opening."""
+        return self.is_moving and self.target_position > self.start_position
+
+    @property
+    def is_closing(self) -> bool:
+        """Return True if cover is closing."""
+        return self.is_moving and self.target_position < self.start_position
+
+    @property
+    def end_time(self) -> float:
+        """Return predicted movement end (monotonic time)."""
+        return self._started + self._get_duration(self.start_position, self.target_position)
+
+    def start(self, position: int, target: int, now: float | None = None):
+        """Start movement from position to target."""
+        if now is None:
+            now = monotonic()
+        self.start_position = position
+        self.target_position = target if target != position else None
+        self._started = now
+
+    def get_position(self, now: float | None = None) -> int:
+        """Return estimated position."""
+        if not self.is_moving:
+            return self.start_position
+        if now is None:
+            now = monotonic()
+        distance = abs(self.target_position - self.start_position)
+        traveled = min(distance, (now - self._started) * 100 / self.travel_time)
+        if self.target_position < self.start_position:
+            traveled = -traveled
+        return round(self.start_position + traveled)
+
+    def finish(self, reported: int, now: float | None = None) -> bool:
+        """Calibrate travel time with position reported at predicted end.
+
+        Return: True if cover reached target, False if it is still moving.
+        """
+        if now is None:
+            now = monotonic()
+        target = self.target_position
+        elapsed = now - self._started
+        moved = abs(reported - self.start_position)
+        if reported == target:
+            self.travel_time *= CALIBRATION_SHRINK
+        elif moved and elapsed > 0:
+            measured = elapsed * 100 / moved
+            self.travel_time += CALIBRATION_ALPHA * (measured - self.travel_time)
+        self.start(reported, reported, now)
+        return reported == target
+
+    def _get_duration(self, position: int, target: int) -> float:
+        """Return time (in seconds) of movement between positions."""
+        return abs(target - position) * self.travel_time / 100
@@ -0,0 +1,98 @@
+"""Device state snapshots used to detect changes between polls."""
+from __future__ import annotations
+
+from foxrestapiclient.connection.rest_api_responses import RestApiDeviceInfoResponse
+from foxrestapiclient.devices.fox_dim1s2_device import FoxDIM1S2Device
+from foxrestapiclient.devices.fox_led2s2_device import FoxLED2S2Device
+from foxrestapiclient.devices.fox_r1s1_device import FoxR1S1Device
+from foxrestapiclient.devices.fox_r2s2_device import FoxR2S2Device
+from foxrestapiclient.devices.fox_rgbw_device import FoxRGBWDevice
+from foxrestapiclient.devices.fox_str1s2_device import FoxSTR1S2Device
+
+
+# Device attributes persisted between Home Assistant restarts.
+PERSISTED_STATE_ATTRIBUTES = {
+    FoxLED2S2Device: (
+        "channel_one_state",
+        "channel_two_state",
+        "channel_one_brightness",
+        "channel_two_brightness",
+    ),
+    FoxDIM1S2Device: ("state", "brightness"),
+    FoxRGBWDevice: ("_state", "hsv_color"),
+    FoxR1S1Device: ("_state", "all_sensor_values"),
+    FoxR2S2Device: ("channel_one_state", "channel_two_state"),
+    FoxSTR1S2Device: ("_cover_position", "_tilt_position"),
+}
+# Device info response fields, keyed by RestApiDeviceInfoResponse argument.
+PERSISTED_INFO_ATTRIBUTES = {
+    "device_name": "device_name",
+    "firmware": "firmware",
+    "hw": "hardware",
+    "updater": "updater",
+    "device_friendly_name": "device_friendly_name",
+    "device_commercial_name": "device_commercial_name",
+    "device_channels_name": "device_channels_name",
+    "status": "status",
+}
+
+
+def get_device_snapshot(device) -> tuple:
+    """Return comparable snapshot of values exposed by device entities."""
+    if isinstance(device, FoxLED2S2Device):
+        values = (
+            device.channel_one_state,
+            device.channel_two_state,
+            device.channel_one_brightness,
+            device.channel_two_brightness,
+        )
+    elif isinstance(device, FoxDIM1S2Device):
+        values = (device.state, device.brightness)
+    elif isinstance(device, FoxRGBWDevice):
+        values = (device.is_on(), tuple(device.get_hsv_color()))
+    elif isinstance(device, FoxR1S1Device):
+        values = (device.is_on(),)
+    elif isinstance(device, FoxR2S2Device):
+        values = (device.channel_one_state, device.channel_two_state)
+    elif isinstance(device, FoxSTR1S2Device):
+        values = (device.get_cover_position(), device.get_tilt_position())
+    else:
+        values = ()
+    return (device.is_available, device.name) + values
+
+
+def get_channel_state(device, channel: int | None = None) -> bool:
+    """Return cached channel state, for covers True means open."""
+    if isinstance(device, FoxSTR1S2Device):
+        return not device.is_cover_closed()
+    return device.is_on(channel)
+
+
+def dump_device(device) -> dict:
+    """Return JSON serializable last known device info and state."""
+    info = None
+    if device.device_info_data is not None:
+        info = {
+            arg: getattr(device.device_info_data, attr)
+            for arg, attr in PERSISTED_INFO_ATTRIBUTES.items()
+        }
+    return {
+        "name": device.name,
+        "is_available": device.is_available,
+        "info": info,
+        "state": {
+            attr: getattr(device, attr)
+            for attr in PERSISTED_STATE_ATTRIBUTES.get(type(device), ())
+        },
+    }
+
+
+def restore_device(device, data: dict):
+    """Restore device info and state dumped by dump_device()."""
+    device.name = data["name"]
+    device.is_available = data["is_available"]
+    if data["info"] is not None:
+        device.device_info_data = RestApiDeviceInfoResponse(**data["info"])
+    for attr in PERSISTED_STATE_ATTRIBUTES.get(type(device), ()):
+        if attr in data["state"]:
+            setattr(device, attr, data["state"][attr])
@@ -0,0 +1,21 @@
+"""Diagnostics support for F&F Fox devices."""
+from __future__ import annotations
+
+from typing import Any
+
+from . import FoxDevicesCoordinator
+from .const import DOMAIN
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: FoxDevicesCoordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "options": dict(entry.options),
+        "devices": coordinator.get_diagnostics(),
+        "metrics": coordinator.metrics.as_dict(),
+    }
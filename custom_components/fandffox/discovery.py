@@ -0,0 +1,110 @@
+"""F&F Fox devices discovery with parallel API key validation."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import aiohttp
+from foxrestapiclient.devices.fox_base_device import DeviceData, FoxBaseDevice
+from foxrestapiclient.devices.fox_service_discovery import FoxServiceDiscovery
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DATA_DISCOVERY_TASK,
+    DISCOVERY_MAX_PARALLEL,
+    DISCOVERY_POLL_INTERVAL,
+    DISCOVERY_PROBE_TIMEOUT,
+    DISCOVERY_TRIES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FoxDiscoveryEngine:
+    """Discover F&F Fox devices and validate their API keys.
+
+    Devices are probed as soon as their discovery response arrives, so
+    validation runs in parallel with discovery instead of one device at
+    a time in configuration forms.
+    """
+
+    def __init__(
+        self,
+        max_parallel: int = DISCOVERY_MAX_PARALLEL,
+        probe_timeout: float = DISCOVERY_PROBE_TIMEOUT,
+        tries: int = DISCOVERY_TRIES,
+    ) -> None:
+        """Initialize object."""
+        self._service_discovery = FoxServiceDiscovery()
+        self._semaphore = asyncio.Semaphore(max_parallel)
+        self._probe_timeout = probe_timeout
+        self._tries = tries
+        self._probes: dict[tuple[str, str], asyncio.Task] = {}
+        self._results: dict[tuple[str, str], bool] = {}
+
+    def get_discovered_devices(self) -> list[DeviceData]:
+        """Get discovered devices."""
+        return self._service_discovery.get_discovered_devices()
+
+    async def async_discover(self) -> list[DeviceData]:
+        """Discover devices and validate them with their current API key."""
+        discover_task = asyncio.create_task(
+            self._service_discovery.async_discover_devices(self._tries)
+        )
+        while not discover_task.done():
+            self._start_probes()
+            await asyncio.wait({discover_task}, timeout=DISCOVERY_POLL_INTERVAL)
+        devices = discover_task.result()
+        self._start_probes()
+        await asyncio.gather(*self._probes.values())
+        return devices
+
+    def is_api_key_valid(self, device_data: DeviceData) -> bool | None:
+        """Return cached validation result, None if device was not probed with key."""
+        return self._results.get((device_data.mac_addr, device_data.api_key))
+
+    def _start_probes(self):
+        """Start probe of every discovered device not probed yet."""
+        for device_data in self.get_discovered_devices():
+            key = (device_data.mac_addr, device_data.api_key)
+            if key not in self._probes:
+                self._probes[key] = asyncio.create_task(self._async_probe(device_data))
+
+    async def _async_probe(self, device_data: DeviceData):
+        """Fetch device info to check API key."""
+        key = (device_data.mac_addr, device_data.api_key)
+        async with self._semaphore:
+            try:
+                self._results[key] = await asyncio.wait_for(
+                    FoxBaseDevice(device_data).async_fetch_device_info(),
+                    self._probe_timeout,
+                )
+            except asyncio.TimeoutError:
+                _LOGGER.info("F&F Fox device %s did not respond to probe.", device_data.host)
+                self._results[key] = False
+            except (aiohttp.ClientError, ValueError, TypeError, KeyError) as error:
+                #E.g. device with not default API key returns unexpected response
+                _LOGGER.info("F&F Fox device %s probe failed: %s", device_data.host, error)
+                self._results[key] = False
+
+
+async def async_shared_discover(hass: HomeAssistant) -> FoxDiscoveryEngine:
+    """Discover devices, concurrent callers share single discovery run.
+
+    Discovery listens on fixed UDP port, so parallel runs would steal
+    responses from each other.
+    """
+    task = hass.data.get(DATA_DISCOVERY_TASK)
+    if task is None:
+        engine = FoxDiscoveryEngine()
+
+        async def async_discover() -> FoxDiscoveryEngine:
+            try:
+                await engine.async_discover()
+                return engine
+            finally:
+                hass.data.pop(DATA_DISCOVERY_TASK, None)
+
+        task = hass.data[DATA_DISCOVERY_TASK] = hass.async_create_task(async_discover())
+    return await asyncio.shield(task)
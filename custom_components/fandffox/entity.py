@@ -0,0 +1,77 @@
+"""Base entity for F&F Fox devices."""
+from __future__ import annotations
+
+from foxrestapiclient.devices.fox_base_device import FoxBaseDevice
+
+from .const import SIGNAL_DEVICE_REMOVED
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.update_coordinator import (
+    CoordinatorEntity,
+    DataUpdateCoordinator,
+)
+
+
+class FoxEntity(CoordinatorEntity):
+    """Entity bound directly to F&F Fox device object.
+
+    Identity values are computed once at construction, not on every
+    state write. Entity is removed when its device is removed from
+    coordinator. After coordinator refresh state is written only if
+    values exposed by entity changed.
+    """
+
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator,
+        device: FoxBaseDevice,
+        unique_id: str,
+        name: str,
+    ) -> None:
+        """Initialize object."""
+        super().__init__(coordinator)
+        self._device = device
+        self._attr_unique_id = unique_id
+        self._attr_name = name
+        self._attr_device_info = device.get_device_info()
+        self._last_snapshot = None
+
+    @property
+    def available(self):
+        """Return True if entity is available."""
+        return self._device.is_available
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to device removal."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_DEVICE_REMOVED.format(self._device.mac_addr),
+                self.async_remove,
+            )
+        )
+
+    def _state_snapshot(self) -> tuple:
+        """Return values exposed by entity."""
+        return (self.available,)
+
+    def _is_fetched_since(self, time: float) -> bool:
+        """Return True if device was fully fetched after given monotonic time."""
+        return self.coordinator.get_last_fetch_time(self._device) > time
+
+    def _is_state_changed(self, snapshot: tuple) -> bool:
+        """Return True if snapshot differs from last written state."""
+        return snapshot != self._last_snapshot
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if it changed."""
+        if self._is_state_changed(self._state_snapshot()):
+            self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Remember written values and write state."""
+        self._last_snapshot = self._state_snapshot()
+        super().async_write_ha_state()
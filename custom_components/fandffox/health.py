@@ -0,0 +1,97 @@
+"""Per-device health tracking with circuit breaker."""
+from __future__ import annotations
+
+from datetime import datetime
+from time import monotonic
+
+from homeassistant.util import dt as dt_util
+
+# Consecutive failures which open device circuit.
+CIRCUIT_FAILURE_THRESHOLD = 3
+# Weight of newest sample in latency moving average.
+LATENCY_EWMA_ALPHA = 0.2
+# Maximal backoff doubling exponent, keeps backoff computation bounded.
+MAX_BACKOFF_EXPONENT = 16
+
+
+class DeviceHealth:
+    """Health state of single device."""
+
+    def __init__(self) -> None:
+        """Initialize object."""
+        self.consecutive_failures = 0
+        self.last_success: datetime | None = None
+        self.latency_ewma: float | None = None
+        self.retry_at = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if device circuit is open."""
+        return self.consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD
+
+    def as_dict(self) -> dict:
+        """Return health as diagnostics dictionary."""
+        return {
+            "consecutive_failures": self.consecutive_failures,
+            "last_success": None if self.last_success is None else self.last_success.isoformat(),
+            "latency_ewma": self.latency_ewma,
+            "circuit_open": self.is_open,
+        }
+
+
+class DeviceHealthMonitor:
+    """Track device failures and keep failing devices out of poll cycles.
+
+    After CIRCUIT_FAILURE_THRESHOLD consecutive failures device circuit is
+    opened and device is not polled. It is only probed with single cheap
+    request when its backoff expires, backoff doubles after every failed
+    probe up to the ceiling. First successful request closes the circuit.
+    """
+
+    def __init__(self, min_backoff: float, max_backoff: float) -> None:
+        """Initialize object."""
+        self._min_backoff = min_backoff
+        self._max_backoff = max(min_backoff, max_backoff)
+        self._health: dict[str, DeviceHealth] = {}
+
+    def get(self, mac_addr: str) -> DeviceHealth:
+        """Return health of device."""
+        return self._health.setdefault(mac_addr, DeviceHealth())
+
+    def is_open(self, mac_addr: str) -> bool:
+        """Return True if device should not be polled."""
+        health = self._health.get(mac_addr)
+        return health is not None and health.is_open
+
+    def is_probe_due(self, mac_addr: str, now: float | None = None) -> bool:
+        """Return True if device with open circuit should be probed now."""
+        if now is None:
+            now = monotonic()
+        return self.get(mac_addr).retry_at <= now
+
+    def record_success(self, mac_addr: str, latency: float):
+        """Record successful request and close device circuit."""
+        health = self.get(mac_addr)
+        health.consecutive_failures = 0
+        health.last_success = dt_util.utcnow()
+        if health.latency_ewma is None:
+            health.latency_ewma = latency
+        else:
+            health.latency_ewma += LATENCY_EWMA_ALPHA * (latency - health.latency_ewma)
+
+    def record_failure(self, mac_addr: str, now: float | None = None):
+        """Record failed request, open or extend device circuit."""
+        if now is None:
+            now = monotonic()
+        health = self.get(mac_addr)
+        health.consecutive_failures += 1
+        if health.is_open:
+            backoff = self._min_backoff * 2 ** min(
+                health.consecutive_failures - CIRCUIT_FAILURE_THRESHOLD,
+                MAX_BACKOFF_EXPONENT,
+            )
+            health.retry_at = now + min(backoff, self._max_backoff)
+
+    def remove(self, mac_addr: str):
+        """Forget device."""
+        self._health.pop(mac_addr, None)
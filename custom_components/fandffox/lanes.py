@@ -0,0 +1,73 @@
+"""Per-device request queue with priority lanes."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+
+# Request priorities, lower value is served first.
+PRIORITY_COMMAND = 0
+PRIORITY_CONFIRM = 1
+PRIORITY_POLL = 2
+
+
+class DeviceRequestGate:
+    """Let single request at a time to device, highest priority first.
+
+    Modules handle few connections, so requests to one device are not sent
+    concurrently. Command waits only for request already in progress,
+    background polls queued for the device are skipped, command is followed
+    by confirm refresh anyway.
+    """
+
+    def __init__(self) -> None:
+        """Initialize object."""
+        self._busy = False
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    async def async_acquire(self, priority: int) -> bool:
+        """Wait for turn of request.
+
+        Return: True if request can be sent, False if it was skipped.
+        Granted request must call release().
+        """
+        if priority < PRIORITY_POLL:
+            self._skip_polls()
+        if not self._busy:
+            self._busy = True
+            return True
+        future = asyncio.get_running_loop().create_future()
+        waiter = (priority, next(self._counter), future)
+        heapq.heappush(self._waiters, waiter)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.result():
+                #Turn was granted, pass it on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            raise
+
+    def release(self):
+        """Finish request and grant turn to next waiting one."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(True)
+                return
+        self._busy = False
+
+    def _skip_polls(self):
+        """Skip background polls waiting for turn."""
+        waiters = []
+        for waiter in self._waiters:
+            if waiter[0] == PRIORITY_POLL:
+                if not waiter[2].done():
+                    waiter[2].set_result(False)
+            else:
+                waiters.append(waiter)
+        heapq.heapify(waiters)
+        self._waiters = waiters
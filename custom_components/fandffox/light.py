@@ -1,13 +1,16 @@
 """Platform for light integration."""
-from datetime import timedelta
 import logging
 
+from foxrestapiclient.devices.const import SUPPORTED_PLATFORM_LIGHT
+from foxrestapiclient.devices.fox_base_device import FoxBaseDevice
 from foxrestapiclient.devices.fox_dim1s2_device import FoxDIM1S2Device
 from foxrestapiclient.devices.fox_led2s2_device import FoxLED2S2Device
 from foxrestapiclient.devices.fox_rgbw_device import FoxRGBWDevice
 
 from . import FoxDevicesCoordinator
-from .const import DOMAIN, POOLING_INTERVAL, SCHEMA_INPUT_UPDATE_POOLING
+from .commands import COMMAND_STATE, CommandBatcher
+from .const import COMMAND_DEBOUNCE_DELAY, DOMAIN
+from .entity import FoxEntity
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
     ATTR_HS_COLOR,
@@ -17,10 +20,7 @@ from homeassistant.components.light import (
     SUPPORT_EFFECT,
     LightEntity,
 )
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
+from homeassistant.core import callback
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,194 +28,245 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up lights entries."""
 
-    device_coordinator: FoxDevicesCoordinator = hass.data[DOMAIN][config_entry.entry_id]
-    entities = []
-
-    async def async_update_data():
-        """Fetch data from API endpoint.
-
-        This is the place to pre-process the data to lookup tables
-        so entities can quickly look up their data.
-        """
-
-        await device_coordinator.async_fetch_light_devices()
-
-        return device_coordinator.get_light_devices()
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        # Name of the data. For logging purposes.
-        name="light",
-        update_method=async_update_data,
-        # Polling interval. Will only be polled if there are subscribers.
-        update_interval=timedelta(seconds=(
-            POOLING_INTERVAL if SCHEMA_INPUT_UPDATE_POOLING not in config_entry.options
-            else config_entry.options.get(SCHEMA_INPUT_UPDATE_POOLING))),
+    coordinator: FoxDevicesCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    def create_entities(device):
+        entities = []
+        if isinstance(device, FoxLED2S2Device):
+            for channel in device.channels:
+                entities.append(FoxLED2S2Light(coordinator, device, channel))
+        elif isinstance(device, FoxDIM1S2Device):
+            entities.append(FoxDIM1S2Light(coordinator, device, 1))
+        elif isinstance(device, FoxRGBWDevice):
+            entities.append(FoxRGBWLight(coordinator, device, 1))
+        return entities
+
+    coordinator.async_setup_platform(
+        config_entry, SUPPORTED_PLATFORM_LIGHT, async_add_entities, create_entities
     )
-
-    await coordinator.async_config_entry_first_refresh()
-    for idx, ent in enumerate(coordinator.data):
-        if isinstance(ent, FoxLED2S2Device):
-            for channel in ent.channels:
-                entities.append(FoxLED2S2Light(coordinator, idx, channel))
-        elif isinstance(ent, FoxDIM1S2Device):
-            entities.append(FoxDIM1S2Light(coordinator, idx, 1))
-        elif isinstance(ent, FoxRGBWDevice):
-            entities.append(FoxRGBWLight(coordinator, idx, 1))
-
-    async_add_entities(entities)
     return True
 
 
-class FoxBaseLight(CoordinatorEntity, LightEntity):
+class FoxBaseLight(FoxEntity, LightEntity):
     """Fox base light implementation."""
 
-    def __init__(self, coordinator, idx, channel=None) -> None:
+    def __init__(self, coordinator, device: FoxBaseDevice, channel=None) -> None:
         """Initialize object."""
-        super().__init__(coordinator)
-        self._idx = idx
+        super().__init__(
+            coordinator,
+            device,
+            f"{device.mac_addr}-{device.device_platform}-{channel}",
+            device.name,
+        )
         self._channel = channel
-
-    @property
-    def name(self):
-        """Return the name of the device."""
-        return self.coordinator.data[self._idx].name
+        #Expected state shown until device refresh confirms command
+        self._optimistic_is_on = None
+        self._optimistic_brightness = None
+        self._optimistic_since = 0.0
+        self._command_batcher = CommandBatcher(
+            coordinator.hass, self._async_send_command, COMMAND_DEBOUNCE_DELAY
+        )
 
     @property
     def is_on(self):
         """Return is on value."""
-        return self.coordinator.data[self._idx].is_on(self._channel)
+        if self._optimistic_is_on is not None:
+            return self._optimistic_is_on
+        return self._device.is_on(self._channel)
 
     @property
-    def available(self):
-        """Return True if entity is available."""
-        return self.coordinator.data[self._idx].is_available
+    def brightness(self):
+        """Return brightness value."""
+        if self._optimistic_brightness is not None:
+            return self._optimistic_brightness
+        return self._device_brightness
 
     @property
-    def unique_id(self) -> str:
-        """Return a unique ID."""
-        device = self.coordinator.data[self._idx]
-        return f"{device.mac_addr}-{device.device_platform}-{self._channel}"
+    def _device_brightness(self):
+        """Return brightness value reported by device."""
+        return None
 
-    @property
-    def device_info(self):
-        """Return device info."""
-        return self.coordinator.data[self._idx].get_device_info()
+    def _state_snapshot(self) -> tuple:
+        """Return values exposed by entity."""
+        return (self.available, self.is_on, self.brightness)
 
-    @property
-    def should_poll(self):
-        """Return the polling state. Polling is needed."""
-        return True
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Drop expected state when device data fetched after command arrives.
+
+        Listeners are also called after refresh of other devices, which does
+        not confirm command sent to this device.
+        """
+        if self._is_fetched_since(self._optimistic_since):
+            self._reset_optimistic_state()
+        super()._handle_coordinator_update()
+
+    def _reset_optimistic_state(self):
+        """Reset expected state."""
+        self._optimistic_is_on = None
+        self._optimistic_brightness = None
+
+    @callback
+    def _async_confirm_command(self):
+        """Write expected state and schedule device refresh to confirm it."""
+        if not self.coordinator.optimistic:
+            self._reset_optimistic_state()
+        self.async_write_ha_state()
+        self.coordinator.async_schedule_device_refresh(self._device)
+
+    def _set_optimistic_state(self, applied: dict):
+        """Set expected state from attributes accepted by device."""
+        if applied:
+            self._optimistic_since = self.coordinator.get_last_command_time(self._device)
+        if COMMAND_STATE in applied:
+            self._optimistic_is_on = applied[COMMAND_STATE]
+        if ATTR_BRIGHTNESS in applied:
+            self._optimistic_brightness = applied[ATTR_BRIGHTNESS]
+
+    async def _async_send_channel_state(self, state: bool, applied: dict):
+        """Send channel state if it differs from current one."""
+        if self._device.is_on(self._channel) is not state:
+            if await self.coordinator.async_send_command(
+                self._device,
+                "update_channel_state",
+                self._device.async_update_channel_state(state, self._channel),
+            ):
+                applied[COMMAND_STATE] = state
+
+    async def _async_send_command(self, command: dict) -> dict:
+        """Send merged command using minimal number of requests."""
+        applied = {}
+        await self._async_send_channel_state(command[COMMAND_STATE], applied)
+        if command[COMMAND_STATE] is False:
+            return applied
+        brightness = command.get(ATTR_BRIGHTNESS)
+        if brightness is not None and brightness != self._device_brightness:
+            if await self.coordinator.async_send_command(
+                self._device,
+                "update_channel_brightness",
+                self._device.async_update_channel_brightness(brightness, self._channel),
+            ):
+                applied[ATTR_BRIGHTNESS] = brightness
+        return applied
+
+    async def _async_submit_command(self, command: dict):
+        """Submit command to batcher and show its expected result."""
+        self.coordinator.mark_device_active(self._device)
+        self._set_optimistic_state(await self._command_batcher.async_submit(command))
+        self._async_confirm_command()
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn on light."""
-        if self.coordinator.data[self._idx].is_on(self._channel) is False:
-            await self.coordinator.data[self._idx].async_update_channel_state(
-                True, self._channel
-            )
-        if kwargs == {}:
-            return
-        if ATTR_BRIGHTNESS in kwargs:
-            await self.coordinator.data[self._idx].async_update_channel_brightness(
-                kwargs[ATTR_BRIGHTNESS], self._channel
-            )
+        command = {COMMAND_STATE: True}
+        for attr in (ATTR_BRIGHTNESS, ATTR_HS_COLOR):
+            if attr in kwargs:
+                command[attr] = kwargs[attr]
+        await self._async_submit_command(command)
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn off light."""
-        if self.coordinator.data[self._idx].is_on(self._channel) is True:
-            await self.coordinator.data[self._idx].async_update_channel_state(
-                False, self._channel
-            )
+        await self._async_submit_command({COMMAND_STATE: False})
 
 
 class FoxDimmableLight(FoxBaseLight):
     """Fox dimmable light implementation."""
 
-    def __init__(self, coordinator, idx, channel) -> None:
-        """Initialize object."""
-        super().__init__(coordinator, idx, channel=channel)
-
-    @property
-    def supported_features(self):
-        """Return supported features."""
-        return SUPPORT_BRIGHTNESS
+    _attr_supported_features = SUPPORT_BRIGHTNESS
+    _attr_color_mode = COLOR_MODE_BRIGHTNESS
 
-    @property
-    def color_mode(self):
-        """Return the color mode of the light."""
-        return COLOR_MODE_BRIGHTNESS
+    def __init__(self, coordinator, device, channel) -> None:
+        """Initialize object."""
+        super().__init__(coordinator, device, channel=channel)
 
 
 class FoxLED2S2Light(FoxDimmableLight):
     """Fox led2s2 light implementation."""
 
-    def __init__(self, coordinator, idx, channel) -> None:
+    def __init__(self, coordinator, device, channel) -> None:
         """Initialize object."""
-        super().__init__(coordinator, idx, channel=channel)
+        super().__init__(coordinator, device, channel=channel)
 
     @property
-    def brightness(self):
-        """Set brightness."""
+    def _device_brightness(self):
+        """Get channel brightness."""
         if self._channel == 1:
-            return self.coordinator.data[self._idx].channel_one_brightness
-        return self.coordinator.data[self._idx].channel_two_brightness
+            return self._device.channel_one_brightness
+        return self._device.channel_two_brightness
 
 
 class FoxDIM1S2Light(FoxDimmableLight):
     """Fox dim1s2 light implementation."""
 
-    def __init__(self, coordinator, idx, channel=None) -> None:
+    def __init__(self, coordinator, device, channel=None) -> None:
         """Initialize object."""
-        super().__init__(coordinator, idx, channel=channel)
+        super().__init__(coordinator, device, channel=channel)
 
     @property
-    def brightness(self):
+    def _device_brightness(self):
         """Get brightness."""
-        return self.coordinator.data[self._idx].brightness
-
-    @property
-    def is_on(self):
-        """Get is on property."""
-        return self.coordinator.data[self._idx].is_on()
+        return self._device.brightness
 
 
 class FoxRGBWLight(FoxBaseLight):
     """Fox rgbw light implementation."""
 
-    def __init__(self, coordinator, idx, channel=None) -> None:
-        """Initialize object."""
-        super().__init__(coordinator, idx, channel=channel)
+    _attr_supported_features = SUPPORT_BRIGHTNESS | SUPPORT_COLOR | SUPPORT_EFFECT
 
-    @property
-    def supported_features(self):
-        """Return supported features."""
-        return SUPPORT_BRIGHTNESS | SUPPORT_COLOR | SUPPORT_EFFECT
+    def __init__(self, coordinator, device, channel=None) -> None:
+        """Initialize object."""
+        super().__init__(coordinator, device, channel=channel)
+        self._optimistic_hs_color = None
 
     @property
-    def brightness(self):
+    def _device_brightness(self):
         """Return brightness value."""
-        return self.coordinator.data[self._idx].get_brightness()
+        return self._device.get_brightness()
 
     @property
     def hs_color(self):
         """Get HS color."""
-        return self.coordinator.data[self._idx].get_hs_color()
+        if self._optimistic_hs_color is not None:
+            return self._optimistic_hs_color
+        return self._device.get_hs_color()
 
-    async def async_turn_on(self, **kwargs) -> None:
-        """Turn on device."""
-        if self.coordinator.data[self._idx].is_on(self._channel) is False:
-            await self.coordinator.data[self._idx].async_update_channel_state(
-                True, self._channel
-            )
-        if kwargs == {}:
-            return
-        if ATTR_HS_COLOR in kwargs:
-            hs = kwargs[ATTR_HS_COLOR]
+    def _state_snapshot(self) -> tuple:
+        """Return values exposed by entity."""
+        return super()._state_snapshot() + (tuple(self.hs_color),)
+
+    def _reset_optimistic_state(self):
+        """Reset expected state."""
+        super()._reset_optimistic_state()
+        self._optimistic_hs_color = None
+
+    def _set_optimistic_state(self, applied: dict):
+        """Set expected state from attributes accepted by device."""
+        super()._set_optimistic_state(applied)
+        if ATTR_HS_COLOR in applied:
+            self._optimistic_hs_color = applied[ATTR_HS_COLOR]
+
+    async def _async_send_command(self, command: dict) -> dict:
+        """Send merged command using minimal number of requests.
+
+        Color and brightness are sent together in one HSV request.
+        """
+        applied = {}
+        await self._async_send_channel_state(command[COMMAND_STATE], applied)
+        if command[COMMAND_STATE] is False:
+            return applied
+        hsv = {}
+        hs = command.get(ATTR_HS_COLOR)
+        if hs is not None and list(hs) != self._device.get_hs_color():
             # Hue minus 1 because Fox RGBW device supports hue in range 0 - 359
-            await self.coordinator.data[self._idx].async_set_color_hsv(hs[0] - 1, hs[1])
-        elif ATTR_BRIGHTNESS in kwargs:
-            await self.coordinator.data[self._idx].async_set_brightness(
-                (kwargs[ATTR_BRIGHTNESS] / 255)
-                * 100  # Fox RGBW light supports brightness from 0 to 100
-            )
+            hsv.update({"hue": hs[0] - 1, "saturation": hs[1]})
+        brightness = command.get(ATTR_BRIGHTNESS)
+        if brightness is not None and brightness != self._device_brightness:
+            # Fox RGBW light supports brightness from 0 to 100
+            hsv["value"] = (brightness / 255) * 100
+        if hsv and await self.coordinator.async_send_command(
+            self._device, "set_color_hsv", self._device.async_set_color_hsv(**hsv)
+        ):
+            if "hue" in hsv:
+                applied[ATTR_HS_COLOR] = [hs[0], hs[1]]
+            if "value" in hsv:
+                applied[ATTR_BRIGHTNESS] = brightness
+        return applied
@@ -0,0 +1,36 @@
+"""R1S1 energy meter fetch helpers.
+
+FoxR1S1Device.async_fetch_update() reads relay state and both energy
+blocks in one go. Integration splits it, so relay state follows the
+regular polling interval and energy readings the metering interval.
+"""
+from __future__ import annotations
+
+from foxrestapiclient.devices.fox_r1s1_device import FoxR1S1Device
+
+
+async def async_fetch_relay_state(device: FoxR1S1Device):
+    """Fetch device info and relay state without energy readings."""
+    await device.async_fetch_device_info()
+    device._state = await device.async_fetch_channel_state()  # pylint: disable=protected-access
+
+
+async def async_fetch_meter_data(device: FoxR1S1Device):
+    """Fetch AC parameters and total energy readings."""
+    api_client = FoxR1S1Device.DeviceRestApiImplementer(
+        device._rest_api_client  # pylint: disable=protected-access
+    )
+    device.total_energy_data = await api_client.async_fetch_total_energy_data()
+    device.ac_parameters_data = await api_client.async_fetch_ac_parameters_data()
+    device.all_sensor_values = {
+        "voltage": device.ac_parameters_data.voltage,
+        "current": device.ac_parameters_data.current,
+        "power_active": device.ac_parameters_data.power_active,
+        "power_reactive": device.ac_parameters_data.power_reactive,
+        "frequency": device.ac_parameters_data.frequency,
+        "power_factor": device.ac_parameters_data.power_factor,
+        "active_energy": device.total_energy_data.active_energy,
+        "reactive_energy": device.total_energy_data.reactive_energy,
+        "active_energy_import": device.total_energy_data.active_energy_import,
+        "reactive_energy_import": device.total_energy_data.reactive_energy_import,
+    }
@@ -0,0 +1,200 @@
+"""Latency and throughput metrics of F&F Fox device requests."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from time import monotonic
+from typing import Any, Awaitable
+
+# Upper bounds (in seconds) of latency histogram buckets, last one is open.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4)
+# Number of recent phase slots used for percentiles.
+SLOT_HISTORY = 100
+# Number of recent polling intervals used for request means.
+INTERVAL_HISTORY = 20
+# Kinds of device requests counted separately.
+REQUEST_POLL = "poll"
+REQUEST_REFRESH = "refresh"
+REQUEST_METERING = "metering"
+REQUEST_COMMAND = "command"
+REQUEST_KINDS = (REQUEST_POLL, REQUEST_REFRESH, REQUEST_METERING, REQUEST_COMMAND)
+
+
+def get_percentile(values, percentile: float) -> float | None:
+    """Return nearest-rank percentile of values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+
+class OperationStats:
+    """Counters and latency histogram of single operation."""
+
+    def __init__(self) -> None:
+        """Initialize object."""
+        self.success = 0
+        self.error = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def record(self, latency: float, success: bool):
+        """Record single request."""
+        if success:
+            self.success += 1
+        else:
+            self.error += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def as_dict(self) -> dict:
+        """Return stats as diagnostics dictionary."""
+        count = self.success + self.error
+        return {
+            "success": self.success,
+            "error": self.error,
+            "mean_latency": self.total_latency / count if count else None,
+            "max_latency": self.max_latency,
+            "histogram": {
+                f"le_{bound}": value
+                for bound, value in zip((*LATENCY_BUCKETS, "inf"), self.buckets)
+            },
+        }
+
+
+class FoxMetrics:
+    """Request metrics of config entry.
+
+    Every request is recorded per device and operation and aggregated per
+    operation. Requests are also counted by kind (regular poll, refresh out
+    of schedule, metering, command) per polling interval. Durations of
+    phase slots, in which devices are polled, and requests waiting for
+    free request slot are tracked as well.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """Initialize object.
+
+        Keyword arguments:
+        interval -- polling interval (in seconds).
+        """
+        self.interval = interval
+        self._devices: dict[str, dict[str, OperationStats]] = {}
+        self._operations: dict[str, OperationStats] = {}
+        self.slots = 0
+        self.last_slot_duration: float | None = None
+        self.last_slot_polled = 0
+        self._slot_durations: deque[float] = deque(maxlen=SLOT_HISTORY)
+        self.intervals = 0
+        self._interval_requests: deque[dict[str, int]] = deque(maxlen=INTERVAL_HISTORY)
+        self._interval_started = monotonic()
+        self._requests: dict[str, int] = {}
+        self._requests_at_interval: dict[str, int] = {}
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+
+    def record(
+        self,
+        mac_addr: str,
+        operation: str,
+        latency: float,
+        success: bool,
+        kind: str = REQUEST_POLL,
+    ):
+        """Record request sent to device."""
+        self._requests[kind] = self._requests.get(kind, 0) + 1
+        self._devices.setdefault(mac_addr, {}).setdefault(
+            operation, OperationStats()
+        ).record(latency, success)
+        self._operations.setdefault(operation, OperationStats()).record(latency, success)
+
+    async def async_measure(self, mac_addr: str, operation: str, request: Awaitable) -> Any:
+        """Await device request and record it, falsy result is error."""
+        started = monotonic()
+        result = None
+        try:
+            result = await request
+        finally:
+            self.record(
+                mac_addr, operation, monotonic() - started, bool(result), REQUEST_COMMAND
+            )
+        return result
+
+    def record_slot(self, duration: float, polled: int, now: float | None = None):
+        """Record phase slot, close polling interval when it elapsed."""
+        if now is None:
+            now = monotonic()
+        self.slots += 1
+        self.last_slot_duration = duration
+        self.last_slot_polled = polled
+        self._slot_durations.append(duration)
+        if now - self._interval_started < self.interval:
+            return
+        self.intervals += 1
+        self._interval_requests.append(
+            {
+                kind: self._requests.get(kind, 0) - self._requests_at_interval.get(kind, 0)
+                for kind in REQUEST_KINDS
+            }
+        )
+        self._requests_at_interval = dict(self._requests)
+        self._interval_started = now
+
+    def get_requests_per_interval(self) -> dict[str, float | None]:
+        """Return mean number of requests of every kind per polling interval."""
+        count = len(self._interval_requests)
+        return {
+            kind: (
+                sum(requests[kind] for requests in self._interval_requests) / count
+                if count
+                else None
+            )
+            for kind in REQUEST_KINDS
+        }
+
+    @contextmanager
+    def queued(self):
+        """Count request waiting for or holding request slot."""
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            yield
+        finally:
+            self.queue_depth -= 1
+
+    def get_error_count(self, mac_addr: str) -> int:
+        """Return number of failed requests of device."""
+        return sum(stats.error for stats in self._devices.get(mac_addr, {}).values())
+
+    def remove(self, mac_addr: str):
+        """Forget device."""
+        self._devices.pop(mac_addr, None)
+
+    def get_device_dict(self, mac_addr: str) -> dict:
+        """Return device metrics as diagnostics dictionary."""
+        return {
+            operation: stats.as_dict()
+            for operation, stats in self._devices.get(mac_addr, {}).items()
+        }
+
+    def as_dict(self) -> dict:
+        """Return aggregated metrics as diagnostics dictionary."""
+        return {
+            "polling_interval": self.interval,
+            "intervals": self.intervals,
+            "requests_per_interval": self.get_requests_per_interval(),
+            "slots": self.slots,
+            "last_slot_duration": self.last_slot_duration,
+            "last_slot_polled": self.last_slot_polled,
+            "slot_duration_p50": get_percentile(self._slot_durations, 50),
+            "slot_duration_p99": get_percentile(self._slot_durations, 99),
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "operations": {
+                operation: stats.as_dict()
+                for operation, stats in self._operations.items()
+            },
+        }
@@ -0,0 +1,67 @@
+"""Cheap change detection polled before full device fetch."""
+from __future__ import annotations
+
+from time import monotonic
+
+from foxrestapiclient.devices.fox_str1s2_device import FoxSTR1S2Device
+
+
+async def async_fetch_change_indicator(device):
+    """Fetch value which changes with device state using single request.
+
+    It is channel state for relays and lights and open level for covers.
+    Brightness, color and tilt changes alone are not detected, they are
+    refreshed by full fetch.
+    """
+    if isinstance(device, FoxSTR1S2Device):
+        open_level = await FoxSTR1S2Device.DeviceRestApiImplementer(
+            device._rest_api_client  # pylint: disable=protected-access
+        ).async_get_open_level()
+        return (open_level.status, open_level.level)
+    state = await device.async_fetch_channel_state()
+    return tuple(state) if isinstance(state, list) else state
+
+
+class ChangeProbe:
+    """Decide if device needs full fetch in current cycle.
+
+    Device is fully fetched when probe value differs from previous one,
+    on first poll and when full refresh deadline expired.
+    """
+
+    def __init__(self, full_refresh_interval: float) -> None:
+        """Initialize object."""
+        self._full_refresh_interval = full_refresh_interval
+        self._values: dict[str, object] = {}
+        self._changed: dict[str, bool] = {}
+        self._full_fetch_deadline: dict[str, float] = {}
+
+    async def async_probe(self, device):
+        """Fetch change indicator of device and compare it with previous one."""
+        value = await async_fetch_change_indicator(device)
+        mac_addr = device.mac_addr
+        self._changed[mac_addr] = (
+            mac_addr not in self._values or self._values[mac_addr] != value
+        )
+        self._values[mac_addr] = value
+
+    def needs_full_fetch(self, mac_addr: str, now: float | None = None) -> bool:
+        """Return True if probed device should be fully fetched."""
+        if now is None:
+            now = monotonic()
+        return (
+            self._changed.get(mac_addr, True)
+            or self._full_fetch_deadline.get(mac_addr, 0) <= now
+        )
+
+    def record_full_fetch(self, mac_addr: str, now: float | None = None):
+        """Postpone full refresh deadline after device was fully fetched."""
+        if now is None:
+            now = monotonic()
+        self._full_fetch_deadline[mac_addr] = now + self._full_refresh_interval
+
+    def remove(self, mac_addr: str):
+        """Forget device."""
+        self._values.pop(mac_addr, None)
+        self._changed.pop(mac_addr, None)
+        self._full_fetch_deadline.pop(mac_addr, None)
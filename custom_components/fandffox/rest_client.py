@@ -0,0 +1,75 @@
+"""Pooled HTTP transport for F&F Fox RestAPI clients."""
+from __future__ import annotations
+
+import logging
+from urllib.parse import urljoin
+
+import aiohttp
+from foxrestapiclient.connection.const import API_CLIENT_CONNECTION_TIMEOUT
+from foxrestapiclient.connection.rest_api_client import RestApiClient
+from foxrestapiclient.devices.fox_base_device import FoxBaseDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def create_pooled_session(
+    pool_size: int, limit_per_host: int, keep_alive: float
+) -> aiohttp.ClientSession:
+    """Create keep-alive session shared by all devices of config entry."""
+    connector = aiohttp.TCPConnector(
+        limit=pool_size,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keep_alive,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(
+            total=None,
+            sock_connect=API_CLIENT_CONNECTION_TIMEOUT,
+            sock_read=API_CLIENT_CONNECTION_TIMEOUT,
+        ),
+    )
+
+
+def attach_client_session(device: FoxBaseDevice, session: aiohttp.ClientSession):
+    """Route all device requests through given session.
+
+    RestApiClient opens new session for every request and it is not possible
+    to pass one in constructor. Client object is shared with device inner
+    API implementers, so it is switched in place to pooled implementation.
+    """
+    client = device._rest_api_client  # pylint: disable=protected-access
+    client.__class__ = FoxPooledRestApiClient
+    client.session = session
+
+
+class FoxPooledRestApiClient(RestApiClient):
+    """RestAPI client using shared keep-alive session."""
+
+    session: aiohttp.ClientSession
+
+    async def async_make_api_call_get(self, method: str, query_params=None):
+        """Make HTTP GET request by given parameters over shared session."""
+        if not isinstance(method, str):
+            _LOGGER.warning("Wrong argument passed to method. Http method accept only string values.")
+            return None
+        if query_params is not None and not isinstance(query_params, dict):
+            _LOGGER.warning("Wrong argument passed to method. Query params must be dict.")
+            return None
+        try:
+            async with self.session.get(
+                urljoin(self.get_base_api_url(), method), params=query_params
+            ) as resp:
+                response = await resp.read()
+                self._invoke_response_error_hook(None)
+                return response
+        except aiohttp.ClientError as cli_error:
+            _LOGGER.debug(cli_error)
+            self._invoke_response_error_hook(cli_error)
+        return None
+
+    def _invoke_response_error_hook(self, error):
+        """Invoke response error hook registered by device."""
+        hook = self._RestApiClient__response_error_hook  # pylint: disable=no-member
+        if hook is not None:
+            hook(error)
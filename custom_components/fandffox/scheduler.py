@@ -0,0 +1,84 @@
+"""Adaptive per-device polling scheduler."""
+from __future__ import annotations
+
+from time import monotonic
+import zlib
+
+# Interval multiplier applied after poll with no state change.
+BACKOFF_FACTOR = 2
+
+
+def get_phase(mac_addr: str) -> float:
+    """Return deterministic poll phase of device in range <0, 1)."""
+    return (zlib.crc32(mac_addr.encode()) % 1000) / 1000
+
+
+class AdaptivePollScheduler:
+    """Decide which devices should be polled in current cycle.
+
+    Every device starts at base interval. Each poll which returns unchanged
+    state doubles device interval up to the ceiling, any change or command
+    sent to device brings it back to base interval. New device is polled
+    right away, later polls are aligned to per-device phase within base
+    interval, so devices are spread evenly across interval instead of
+    being polled at once.
+    """
+
+    def __init__(self, base_interval: float, max_interval: float) -> None:
+        """Initialize object."""
+        self._base_interval = base_interval
+        self._max_interval = max(base_interval, max_interval)
+        self._intervals: dict[str, float] = {}
+        self._next_poll: dict[str, float] = {}
+        self._epoch = monotonic()
+
+    def is_due(self, mac_addr: str, now: float | None = None) -> bool:
+        """Return True if device should be polled now."""
+        if now is None:
+            now = monotonic()
+        if mac_addr not in self._next_poll:
+            # First poll fetches device info used by its entities
+            return True
+        # Small margin, coordinator timer is not exact
+        return self._next_poll[mac_addr] <= now + self._base_interval / 10
+
+    def update(self, mac_addr: str, changed: bool, now: float | None = None):
+        """Update device interval after poll."""
+        if now is None:
+            now = monotonic()
+        if changed:
+            interval = self._base_interval
+        else:
+            interval = min(
+                self.get_interval(mac_addr) * BACKOFF_FACTOR, self._max_interval
+            )
+        self._intervals[mac_addr] = interval
+        self._next_poll[mac_addr] = self._align(mac_addr, now + interval)
+
+    def _align(self, mac_addr: str, time: float) -> float:
+        """Return device phase point nearest to given time."""
+        phase = self._epoch + get_phase(mac_addr) * self._base_interval
+        return phase + round((time - phase) / self._base_interval) * self._base_interval
+
+    def set_intervals(self, base_interval: float, max_interval: float):
+        """Change base interval and ceiling, current intervals are clamped."""
+        self._base_interval = base_interval
+        self._max_interval = max(base_interval, max_interval)
+        for mac_addr, interval in self._intervals.items():
+            self._intervals[mac_addr] = min(
+                max(interval, self._base_interval), self._max_interval
+            )
+
+    def mark_active(self, mac_addr: str):
+        """Bring device back to fast polling, e.g. after command."""
+        self._intervals[mac_addr] = self._base_interval
+        self._next_poll[mac_addr] = 0
+
+    def remove(self, mac_addr: str):
+        """Forget device."""
+        self._intervals.pop(mac_addr, None)
+        self._next_poll.pop(mac_addr, None)
+
+    def get_interval(self, mac_addr: str) -> float:
+        """Return current effective interval of device."""
+        return self._intervals.get(mac_addr, self._base_interval)
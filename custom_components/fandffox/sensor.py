@@ -1,30 +1,41 @@
 """Support for F&F Fox sensors."""
 from __future__ import annotations
 
-from datetime import timedelta
 import logging
 
+from foxrestapiclient.devices.const import (
+    SUPPORTED_PLATFORM_COVER,
+    SUPPORTED_PLATFORM_LIGHT,
+    SUPPORTED_PLATFORM_SENSOR,
+    SUPPORTED_PLATFORM_SWITCH,
+)
+from foxrestapiclient.devices.fox_r1s1_device import FoxR1S1Device
+
 from . import FoxDevicesCoordinator
-from .const import DOMAIN, POOLING_INTERVAL, SCHEMA_INPUT_UPDATE_POOLING
+from .aggregation import AGGREGATED_KEYS, INTEGRATED_ENERGY_KEY, MeterAggregator
+from .const import DOMAIN, SENSOR_DEADBANDS
+from .entity import FoxEntity
 from homeassistant.components.sensor import (
     DEVICE_CLASS_CURRENT,
+    DEVICE_CLASS_ENERGY,
     DEVICE_CLASS_POWER,
     DEVICE_CLASS_VOLTAGE,
+    STATE_CLASS_MEASUREMENT,
+    STATE_CLASS_TOTAL_INCREASING,
     SensorEntity,
     SensorEntityDescription,
 )
 from homeassistant.const import (
     ELECTRIC_CURRENT_AMPERE,
     ELECTRIC_POTENTIAL_VOLT,
+    ENERGY_KILO_WATT_HOUR,
     FREQUENCY_HERTZ,
     POWER_KILO_WATT,
     POWER_WATT,
+    TIME_MILLISECONDS,
 )
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,59 +45,93 @@ FOX_SENSORS: tuple[SensorEntityDescription, ...] = (
         name="Voltage",
         device_class=DEVICE_CLASS_VOLTAGE,
         native_unit_of_measurement=ELECTRIC_POTENTIAL_VOLT,
+        state_class=STATE_CLASS_MEASUREMENT,
     ),
     SensorEntityDescription(
         key="current",
         name="Current",
         device_class=DEVICE_CLASS_CURRENT,
         native_unit_of_measurement=ELECTRIC_CURRENT_AMPERE,
+        state_class=STATE_CLASS_MEASUREMENT,
     ),
     SensorEntityDescription(
         key="power_active",
         name="Active power",
         device_class=DEVICE_CLASS_POWER,
         native_unit_of_measurement=POWER_WATT,
+        state_class=STATE_CLASS_MEASUREMENT,
     ),
     SensorEntityDescription(
         key="power_reactive",
         name="Reactive power",
         device_class=DEVICE_CLASS_POWER,
         native_unit_of_measurement="var",
+        state_class=STATE_CLASS_MEASUREMENT,
     ),
     SensorEntityDescription(
         key="frequency",
         name="AC Frequency",
         device_class=None,
         native_unit_of_measurement=FREQUENCY_HERTZ,
+        state_class=STATE_CLASS_MEASUREMENT,
     ),
     SensorEntityDescription(
         key="power_factor",
         name="Power factor",
-        device_class=None
+        device_class=None,
+        state_class=STATE_CLASS_MEASUREMENT,
     ),
     SensorEntityDescription(
         key="active_energy",
         name="Active energy",
-        device_class=DEVICE_CLASS_POWER,
-        native_unit_of_measurement=POWER_WATT,
+        device_class=DEVICE_CLASS_ENERGY,
+        native_unit_of_measurement=ENERGY_KILO_WATT_HOUR,
+        state_class=STATE_CLASS_TOTAL_INCREASING,
     ),
     SensorEntityDescription(
         key="reactive_energy",
         name="Reactive energy",
-        device_class=DEVICE_CLASS_POWER,
-        native_unit_of_measurement="var",
+        device_class=None,
+        native_unit_of_measurement="kvarh",
+        state_class=STATE_CLASS_TOTAL_INCREASING,
     ),
     SensorEntityDescription(
         key="active_energy_import",
         name="Active energy import",
-        device_class=DEVICE_CLASS_POWER,
-        native_unit_of_measurement=POWER_WATT,
+        device_class=DEVICE_CLASS_ENERGY,
+        native_unit_of_measurement=ENERGY_KILO_WATT_HOUR,
+        state_class=STATE_CLASS_TOTAL_INCREASING,
     ),
     SensorEntityDescription(
         key="reactive_energy_import",
         name="Reactive energy import",
-        device_class=DEVICE_CLASS_POWER,
-        native_unit_of_measurement="var",
+        device_class=None,
+        native_unit_of_measurement="kvarh",
+        state_class=STATE_CLASS_TOTAL_INCREASING,
+    ),
+)
+
+INTEGRATED_ENERGY_SENSOR = SensorEntityDescription(
+    key=INTEGRATED_ENERGY_KEY,
+    name="Integrated active energy",
+    device_class=DEVICE_CLASS_ENERGY,
+    native_unit_of_measurement=ENERGY_KILO_WATT_HOUR,
+    state_class=STATE_CLASS_TOTAL_INCREASING,
+)
+
+DIAGNOSTIC_SENSORS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="latency",
+        name="Latency",
+        native_unit_of_measurement=TIME_MILLISECONDS,
+        state_class=STATE_CLASS_MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="errors",
+        name="Request errors",
+        state_class=STATE_CLASS_TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
     ),
 )
 
@@ -94,70 +139,150 @@ FOX_SENSORS: tuple[SensorEntityDescription, ...] = (
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up F&F Fox Sensor from Config Entry."""
 
-    entities = []
     device_coordinator: FoxDevicesCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = device_coordinator.metering_coordinator
+    if device_coordinator.cache_restored:
+        hass.async_create_task(coordinator.async_refresh())
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
-    async def async_update_data():
-        """Fetch data from API endpoint.
+    aggregator = device_coordinator.meter_aggregator
+    descriptions = FOX_SENSORS
+    if aggregator is not None:
+        descriptions += (INTEGRATED_ENERGY_SENSOR,)
 
-        This is the place to pre-process the data to lookup tables
-        so entities can quickly look up their data.
-        """
-        return device_coordinator.get_sensor_devices()
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        # Name of the data. For logging purposes.
-        name="sensor",
-        update_method=async_update_data,
-        # Polling interval. Will only be polled if there are subscribers.
-        update_interval=timedelta(seconds=(
-            POOLING_INTERVAL if SCHEMA_INPUT_UPDATE_POOLING not in config_entry.options
-            else config_entry.options.get(SCHEMA_INPUT_UPDATE_POOLING))),
+    def create_entities(device):
+        return [
+            FoxGenericSensor(
+                coordinator,
+                device,
+                description,
+                SENSOR_DEADBANDS.get(description.key)
+                if device_coordinator.sensor_deadband
+                else None,
+                aggregator,
+            )
+            for description in descriptions
+        ]
+
+    device_coordinator.async_setup_platform(
+        config_entry, SUPPORTED_PLATFORM_SENSOR, async_add_entities, create_entities
     )
 
-    await coordinator.async_config_entry_first_refresh()
-    for idx, ent in enumerate(coordinator.data):
-        # if isinstance(ent, FoxR1S1Device):
-        entities += [
-            FoxGenericSensor(coordinator, idx, description)
-            for description in FOX_SENSORS
+    def create_diagnostic_entities(device):
+        return [
+            FoxDiagnosticSensor(device_coordinator, device, description)
+            for description in DIAGNOSTIC_SENSORS
         ]
-    async_add_entities(entities)
+
+    if device_coordinator.diagnostic_sensors:
+        #Every device belongs to one of these platforms
+        for platform in (
+            SUPPORTED_PLATFORM_COVER,
+            SUPPORTED_PLATFORM_LIGHT,
+            SUPPORTED_PLATFORM_SWITCH,
+        ):
+            device_coordinator.async_setup_platform(
+                config_entry, platform, async_add_entities, create_diagnostic_entities
+            )
     return True
 
 
-class FoxGenericSensor(CoordinatorEntity, SensorEntity):
+class FoxGenericSensor(FoxEntity, SensorEntity):
     """Fox generic sensor implementation."""
 
-    def __init__(self, coordinator, idx: int, description: SensorEntityDescription):
-        """Initialize object."""
-        super().__init__(coordinator)
-        self._idx = idx
+    def __init__(
+        self,
+        coordinator,
+        device: FoxR1S1Device,
+        description: SensorEntityDescription,
+        deadband: float | None = None,
+        aggregator: MeterAggregator | None = None,
+    ):
+        """Initialize object.
+
+        Keyword arguments:
+        deadband -- optional minimal value change written to state machine.
+        aggregator -- optional source of downsampled readings.
+        """
+        name = device.name if device.name else "r1s1"
+        super().__init__(
+            coordinator,
+            device,
+            f"{device.mac_addr}-sensor-{description.key}",
+            f"{name}-{device.mac_addr}-sensor-{description.key}",
+        )
         self.entity_description = description
+        self._key = description.key
+        self._deadband = deadband
+        self._aggregator = None
+        if aggregator is not None and (
+            self._key in AGGREGATED_KEYS or self._key == INTEGRATED_ENERGY_KEY
+        ):
+            self._aggregator = aggregator
+
+    def _state_snapshot(self) -> tuple:
+        """Return values exposed by entity."""
+        return (self.available, self.native_value)
+
+    def _is_state_changed(self, snapshot: tuple) -> bool:
+        """Return True if snapshot differs from last written state by deadband."""
+        if self._deadband is None or self._last_snapshot is None:
+            return super()._is_state_changed(snapshot)
+        if snapshot[0] != self._last_snapshot[0]:
+            return True
+        try:
+            return abs(float(snapshot[1]) - float(self._last_snapshot[1])) >= self._deadband
+        except (TypeError, ValueError):
+            return snapshot[1] != self._last_snapshot[1]
 
     @property
-    def name(self):
-        """Return the name of the device."""
-        device = self.coordinator.data[self._idx]
-        name = device.name if not device.name else "r1s1"
-        return f"{name}-{device.mac_addr}-sensor-{self.entity_description.key}"
+    def native_value(self) -> StateType:
+        """Return the value reported by the sensor."""
+        if self._aggregator is not None:
+            return self._aggregator.get_value(self._device.mac_addr, self._key)
+        return self._device.fetch_sensor_value_by_key(self._key)
 
     @property
-    def unique_id(self) -> str:
-        """Return a unique ID."""
-        device = self.coordinator.data[self._idx]
-        return f"{device.mac_addr}-sensor-{self.entity_description.key}"
+    def extra_state_attributes(self):
+        """Return min and max of aggregated reading."""
+        if self._aggregator is None:
+            return None
+        return self._aggregator.get_stats(self._device.mac_addr, self._key)
+
+
+class FoxDiagnosticSensor(FoxEntity, SensorEntity):
+    """Request metrics of F&F Fox device."""
+
+    def __init__(
+        self,
+        coordinator: FoxDevicesCoordinator,
+        device,
+        description: SensorEntityDescription,
+    ):
+        """Initialize object."""
+        super().__init__(
+            coordinator,
+            device,
+            f"{device.mac_addr}-diagnostic-{description.key}",
+            f"{device.name} {description.name}",
+        )
+        self.entity_description = description
+        self._key = description.key
 
     @property
-    def device_info(self):
-        """Return device info."""
-        return self.coordinator.data[self._idx].get_device_info()
+    def available(self):
+        """Return True, metrics are known also for unavailable device."""
+        return True
+
+    def _state_snapshot(self) -> tuple:
+        """Return values exposed by entity."""
+        return (self.native_value,)
 
     @property
     def native_value(self) -> StateType:
-        """Return the value reported by the sensor."""
-        return self.coordinator.data[self._idx].fetch_sensor_value_by_key(
-            self.entity_description.key
-        )
+        """Return latency in milliseconds or failed requests count."""
+        if self._key == "errors":
+            return self.coordinator.metrics.get_error_count(self._device.mac_addr)
+        latency = self.coordinator.get_device_health(self._device.mac_addr).latency_ewma
+        return None if latency is None else round(latency * 1000)
@@ -0,0 +1,156 @@
+"""Services of F&F Fox devices integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import voluptuous as vol
+
+from .const import (
+    BULK_RESULT_NOT_FOUND,
+    DOMAIN,
+    EVENT_BULK_SET_RESULT,
+    SERVICE_BULK_SET,
+    SERVICE_REDISCOVER,
+    SERVICE_REFRESH,
+)
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_STATE
+from homeassistant.core import HomeAssistant, ServiceCall, callback, split_entity_id
+from homeassistant.helpers import config_validation as cv, entity_registry
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_REMOVE_MISSING = "remove_missing"
+ATTR_TARGETS = "targets"
+# Domains of entities which state can be set with bulk set.
+BULK_SET_DOMAINS = ("cover", "light", "switch")
+
+
+def bulk_set_entity_id(value) -> str:
+    """Validate entity ID of light, switch or cover."""
+    entity_id = cv.entity_id(value)
+    if split_entity_id(entity_id)[0] not in BULK_SET_DOMAINS:
+        raise vol.Invalid(
+            f"Entity {entity_id} is not one of: {', '.join(BULK_SET_DOMAINS)}"
+        )
+    return entity_id
+
+
+BULK_SET_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_TARGETS): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Required(ATTR_ENTITY_ID): bulk_set_entity_id,
+                        vol.Required(ATTR_STATE): cv.boolean,
+                    }
+                )
+            ],
+        )
+    }
+)
+
+REFRESH_SCHEMA = vol.Schema({vol.Required(ATTR_ENTITY_ID): cv.entity_ids})
+
+REDISCOVER_SCHEMA = vol.Schema(
+    {vol.Optional(ATTR_REMOVE_MISSING, default=False): cv.boolean}
+)
+
+
+def parse_unique_id(unique_id: str) -> tuple[str, int | None]:
+    """Return MAC address and channel from entity unique ID.
+
+    Unique ID format: {mac_addr}-{platform}[-{channel}]
+    """
+    parts = unique_id.split("-")
+    channel = None
+    if len(parts) > 2 and parts[2].isdigit():
+        channel = int(parts[2])
+    return parts[0], channel
+
+
+@callback
+def async_resolve_entity(
+    hass: HomeAssistant, registry: entity_registry.EntityRegistry, entity_id: str
+) -> tuple[str, str, int | None] | None:
+    """Return config entry ID, MAC address and channel of F&F Fox entity."""
+    entry = registry.async_get(entity_id)
+    if entry is None or entry.config_entry_id not in hass.data[DOMAIN]:
+        return None
+    return (entry.config_entry_id, *parse_unique_id(entry.unique_id))
+
+
+@callback
+def async_setup_services(hass: HomeAssistant):
+    """Register integration services."""
+    if hass.services.has_service(DOMAIN, SERVICE_BULK_SET):
+        return
+
+    async def async_bulk_set(call: ServiceCall):
+        """Set state of many F&F Fox channels at once."""
+        registry = entity_registry.async_get(hass)
+        results = {}
+        targets_by_entry: dict[str, list] = {}
+        for target in call.data[ATTR_TARGETS]:
+            entity_id = target[ATTR_ENTITY_ID]
+            resolved = async_resolve_entity(hass, registry, entity_id)
+            if resolved is None:
+                results[entity_id] = BULK_RESULT_NOT_FOUND
+                continue
+            entry_id, mac_addr, channel = resolved
+            targets_by_entry.setdefault(entry_id, []).append(
+                (entity_id, mac_addr, channel, target[ATTR_STATE])
+            )
+        for entry_results in await asyncio.gather(
+            *(
+                hass.data[DOMAIN][entry_id].async_bulk_set(targets)
+                for entry_id, targets in targets_by_entry.items()
+            )
+        ):
+            results.update(entry_results)
+        _LOGGER.debug("Bulk set results: %s", results)
+        hass.bus.async_fire(EVENT_BULK_SET_RESULT, {"results": results})
+
+    async def async_rediscover(call: ServiceCall):
+        """Add new F&F Fox devices, remove missing ones only if requested."""
+        await asyncio.gather(
+            *(
+                coordinator.async_rediscover(call.data[ATTR_REMOVE_MISSING])
+                for coordinator in list(hass.data[DOMAIN].values())
+            )
+        )
+
+    async def async_refresh(call: ServiceCall):
+        """Pull state of devices which changed, e.g. by wall switch."""
+        registry = entity_registry.async_get(hass)
+        mac_addrs_by_entry: dict[str, set] = {}
+        for entity_id in call.data[ATTR_ENTITY_ID]:
+            resolved = async_resolve_entity(hass, registry, entity_id)
+            if resolved is not None:
+                mac_addrs_by_entry.setdefault(resolved[0], set()).add(resolved[1])
+        await asyncio.gather(
+            *(
+                hass.data[DOMAIN][entry_id].async_refresh_devices(mac_addrs)
+                for entry_id, mac_addrs in mac_addrs_by_entry.items()
+            )
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BULK_SET, async_bulk_set, schema=BULK_SET_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH, async_refresh, schema=REFRESH_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_REDISCOVER, async_rediscover, schema=REDISCOVER_SCHEMA
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant):
+    """Remove integration services."""
+    hass.services.async_remove(DOMAIN, SERVICE_BULK_SET)
+    hass.services.async_remove(DOMAIN, SERVICE_REDISCOVER)
+    hass.services.async_remove(DOMAIN, SERVICE_REFRESH)
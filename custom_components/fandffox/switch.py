@@ -1,17 +1,16 @@
 """Platform for switch integration."""
-from datetime import timedelta
 import logging
 
+from foxrestapiclient.devices.const import SUPPORTED_PLATFORM_SWITCH
+from foxrestapiclient.devices.fox_base_device import FoxBaseDevice
 from foxrestapiclient.devices.fox_r1s1_device import FoxR1S1Device
 from foxrestapiclient.devices.fox_r2s2_device import FoxR2S2Device
 
 from . import FoxDevicesCoordinator
-from .const import DOMAIN, POOLING_INTERVAL, SCHEMA_INPUT_UPDATE_POOLING
+from .const import DOMAIN
+from .entity import FoxEntity
 from homeassistant.components.switch import SwitchEntity
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
+from homeassistant.core import callback
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,98 +18,82 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up switch entries."""
 
-    device_coordinator: FoxDevicesCoordinator = hass.data[DOMAIN][config_entry.entry_id]
-    entities = []
+    coordinator: FoxDevicesCoordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    async def async_update_data():
-        """Fetch data from API endpoint.
+    def create_entities(device):
+        entities = []
+        if isinstance(device, FoxR2S2Device):
+            for channel in device.channels:
+                entities.append(FoxBaseSwitch(coordinator, device, channel))
+        if isinstance(device, FoxR1S1Device):
+            entities.append(FoxBaseSwitch(coordinator, device))
+        return entities
 
-        This is the place to pre-process the data to lookup tables
-        so entities can quickly look up their data.
-        """
-
-        await device_coordinator.async_fetch_switch_devices()
-
-        return device_coordinator.get_switch_devices()
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        # Name of the data. For logging purposes.
-        name="switch",
-        update_method=async_update_data,
-        # Polling interval. Will only be polled if there are subscribers.
-        update_interval=timedelta(seconds=(
-            POOLING_INTERVAL if SCHEMA_INPUT_UPDATE_POOLING not in config_entry.options
-            else config_entry.options.get(SCHEMA_INPUT_UPDATE_POOLING))),
+    coordinator.async_setup_platform(
+        config_entry, SUPPORTED_PLATFORM_SWITCH, async_add_entities, create_entities
     )
-
-    await coordinator.async_config_entry_first_refresh()
-    for idx, ent in enumerate(coordinator.data):
-        if isinstance(ent, FoxR2S2Device):
-            for channel in ent.channels:
-                entities.append(FoxBaseSwitch(coordinator, idx, channel))
-        if isinstance(ent, FoxR1S1Device):
-            entities.append(FoxBaseSwitch(coordinator, idx))
-
-    async_add_entities(entities)
     return True
 
 
-class FoxBaseSwitch(CoordinatorEntity, SwitchEntity):
+class FoxBaseSwitch(FoxEntity, SwitchEntity):
     """Fox base switch implementation."""
 
-    def __init__(self, coordinator, idx: int, channel: int = None):
+    def __init__(self, coordinator, device: FoxBaseDevice, channel: int = None):
         """Initialize object."""
-        super().__init__(coordinator)
-        self._idx = idx
-        self._channel = channel
-
-    @property
-    def name(self):
-        """Return the name of the device."""
-        return (
-            self.coordinator.data[self._idx].name
-            if self._channel is None
-            else self.coordinator.data[self._idx].get_channel_name(self._channel)
+        super().__init__(
+            coordinator,
+            device,
+            f"{device.mac_addr}-{device.device_platform}-{channel}",
+            device.name if channel is None else device.get_channel_name(channel),
         )
+        self._channel = channel
+        #Expected state shown until device refresh confirms command
+        self._optimistic_is_on = None
+        self._optimistic_since = 0.0
 
     @property
     def is_on(self):
         """Return the is on property."""
-        return self.coordinator.data[self._idx].is_on(self._channel)
-
-    @property
-    def available(self):
-        """Return device availability."""
-        return self.coordinator.data[self._idx].is_available
+        if self._optimistic_is_on is not None:
+            return self._optimistic_is_on
+        return self._device.is_on(self._channel)
 
-    @property
-    def unique_id(self) -> str:
-        """Return a unique ID."""
-        device = self.coordinator.data[self._idx]
-        return f"{device.mac_addr}-{device.device_platform}-{self._channel}"
+    def _state_snapshot(self) -> tuple:
+        """Return values exposed by entity."""
+        return (self.available, self.is_on)
 
-    @property
-    def device_info(self):
-        """Return device info data."""
-        return self.coordinator.data[self._idx].get_device_info()
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Drop expected state when device data fetched after command arrives.
 
-    @property
-    def should_poll(self):
-        """Return the polling state. Polling is needed."""
-        return True
+        Listeners are also called after refresh of other devices, which does
+        not confirm command sent to this device.
+        """
+        if self._is_fetched_since(self._optimistic_since):
+            self._optimistic_is_on = None
+        super()._handle_coordinator_update()
+
+    async def _async_set_state(self, state: bool):
+        """Send state to device and show it until refresh confirms it."""
+        self.coordinator.mark_device_active(self._device)
+        if self._device.is_on(self._channel) is not state:
+            if (
+                await self.coordinator.async_send_command(
+                    self._device,
+                    "update_channel_state",
+                    self._device.async_update_channel_state(state, self._channel),
+                )
+                and self.coordinator.optimistic
+            ):
+                self._optimistic_is_on = state
+                self._optimistic_since = self.coordinator.get_last_command_time(self._device)
+                self.async_write_ha_state()
+        self.coordinator.async_schedule_device_refresh(self._device)
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn on the device."""
-        if self.coordinator.data[self._idx].is_on(self._channel) is False:
-            await self.coordinator.data[self._idx].async_update_channel_state(
-                True, self._channel
-            )
+        await self._async_set_state(True)
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn off the device."""
-        if self.coordinator.data[self._idx].is_on(self._channel) is True:
-            await self.coordinator.data[self._idx].async_update_channel_state(
-                False, self._channel
-            )
+        await self._async_set_state(False)
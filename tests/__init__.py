@@ -0,0 +1 @@
+"""Tests for the F&F Fox devices integration."""
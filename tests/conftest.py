@@ -0,0 +1,8 @@
+"""Fixtures for F&F Fox devices integration tests."""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Enable custom integrations in all tests."""
+    yield
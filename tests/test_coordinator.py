@@ -0,0 +1,246 @@
+"""Tests of F&F Fox devices coordinator."""
+from collections import Counter
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+from foxrestapiclient.devices.const import DEVICE_TYPE_LED2S2, DEVICE_TYPE_R2S2
+from foxrestapiclient.devices.fox_led2s2_device import FoxLED2S2Device
+from foxrestapiclient.devices.fox_r2s2_device import FoxR2S2Device
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.fandffox.cache import FoxDeviceCache
+from custom_components.fandffox.const import (
+    DOMAIN,
+    POOLING_INTERVAL,
+    SCHEMA_INPUT_REDISCOVERY_INTERVAL,
+    SERVICE_REDISCOVER,
+)
+from homeassistant.core import callback, split_entity_id
+from homeassistant.util import dt as dt_util
+
+LED2S2_MAC = "00:00:00:00:00:01"
+R2S2_MAC = "00:00:00:00:00:02"
+DISCOVERED_DEVICES = [
+    {
+        "name": "led2s2",
+        "host": "192.168.0.11",
+        "api_key": "000",
+        "mac_addr": LED2S2_MAC,
+        "dev_type": DEVICE_TYPE_LED2S2,
+        "channels": [1, 2],
+        "skip": False,
+    },
+    {
+        "name": "r2s2",
+        "host": "192.168.0.12",
+        "api_key": "000",
+        "mac_addr": R2S2_MAC,
+        "dev_type": DEVICE_TYPE_R2S2,
+        "channels": [1, 2],
+        "skip": False,
+    },
+]
+
+
+async def test_single_fetch_per_device_per_cycle(hass):
+    """Two channel devices are fetched once per cycle, entities do not poll."""
+    fetches = Counter()
+
+    async def async_fetch_device_available_data(device):
+        fetches[device.mac_addr] += 1
+        device.is_available = True
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={"discovered_devices": DISCOVERED_DEVICES},
+        options={SCHEMA_INPUT_REDISCOVERY_INTERVAL: 0},
+    )
+    entry.add_to_hass(hass)
+    with patch.object(
+        FoxLED2S2Device,
+        "async_fetch_device_available_data",
+        async_fetch_device_available_data,
+    ), patch.object(
+        FoxR2S2Device,
+        "async_fetch_device_available_data",
+        async_fetch_device_available_data,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        entity_ids = hass.states.async_entity_ids("light") + hass.states.async_entity_ids(
+            "switch"
+        )
+        assert len(entity_ids) == 4
+        for entity_id in entity_ids:
+            entity = hass.data[split_entity_id(entity_id)[0]].get_entity(entity_id)
+            assert entity.should_poll is False
+        #First refresh is shared by all platforms
+        assert fetches == {LED2S2_MAC: 1, R2S2_MAC: 1}
+
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        for device in coordinator.get_all_devices():
+            coordinator.mark_device_active(device)
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert fetches == {LED2S2_MAC: 2, R2S2_MAC: 2}
+
+        #Devices are not due again within the same interval
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert fetches == {LED2S2_MAC: 2, R2S2_MAC: 2}
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_rediscovery_removes_devices_only_on_request(hass):
+    """Periodic re-discovery keeps missing devices, service removes them on request."""
+
+    async def async_fetch_device_available_data(device):
+        device.is_available = device.mac_addr != R2S2_MAC
+
+    engine = Mock()
+    engine.get_discovered_devices.return_value = []
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={"discovered_devices": DISCOVERED_DEVICES},
+        options={SCHEMA_INPUT_REDISCOVERY_INTERVAL: 0},
+    )
+    entry.add_to_hass(hass)
+    with patch.object(
+        FoxLED2S2Device,
+        "async_fetch_device_available_data",
+        async_fetch_device_available_data,
+    ), patch.object(
+        FoxR2S2Device,
+        "async_fetch_device_available_data",
+        async_fetch_device_available_data,
+    ), patch(
+        "custom_components.fandffox.async_shared_discover", AsyncMock(return_value=engine)
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+
+        for _ in range(5):
+            await coordinator.async_rediscover()
+        assert len(entry.data["discovered_devices"]) == 2
+        assert coordinator.get_device(R2S2_MAC) is not None
+
+        await hass.services.async_call(
+            DOMAIN, SERVICE_REDISCOVER, {"remove_missing": True}, blocking=True
+        )
+        await hass.async_block_till_done()
+        #Only unavailable device is removed
+        assert [config["mac_addr"] for config in entry.data["discovered_devices"]] == [
+            LED2S2_MAC
+        ]
+        assert coordinator.get_device(R2S2_MAC) is None
+        assert not hass.states.async_entity_ids("switch")
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_changed_state_saved_after_device_refresh(hass):
+    """Refresh of single device outside regular cycle saves changed state."""
+    reported = {"state": False}
+
+    async def async_fetch_device_available_data(device):
+        device.is_available = True
+        device.channel_one_state = reported["state"]
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={"discovered_devices": DISCOVERED_DEVICES},
+        options={SCHEMA_INPUT_REDISCOVERY_INTERVAL: 0},
+    )
+    entry.add_to_hass(hass)
+    with patch.object(
+        FoxLED2S2Device,
+        "async_fetch_device_available_data",
+        async_fetch_device_available_data,
+    ), patch.object(
+        FoxR2S2Device,
+        "async_fetch_device_available_data",
+        async_fetch_device_available_data,
+    ), patch.object(FoxDeviceCache, "async_schedule_save") as schedule_save:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        device = coordinator.get_device(R2S2_MAC)
+        schedule_save.reset_mock()
+
+        #Refresh service
+        reported["state"] = True
+        await coordinator.async_refresh_devices([R2S2_MAC])
+        assert schedule_save.call_count == 1
+
+        #Command confirmation
+        reported["state"] = False
+        coordinator.async_schedule_device_refresh(device, 0)
+        await hass.async_block_till_done()
+        assert schedule_save.call_count == 2
+
+        #Unchanged state is not saved
+        coordinator.async_schedule_device_refresh(device, 0)
+        await hass.async_block_till_done()
+        assert schedule_save.call_count == 2
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_entities_notified_only_on_change(hass):
+    """Phase slot which polls only unchanged devices does not notify entities."""
+    fetches = Counter()
+    reported = {"state": False}
+    notifications = []
+
+    async def async_fetch_device_available_data(device):
+        fetches[device.mac_addr] += 1
+        device.is_available = True
+        device.channel_one_state = reported["state"]
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={"discovered_devices": DISCOVERED_DEVICES},
+        options={SCHEMA_INPUT_REDISCOVERY_INTERVAL: 0},
+    )
+    entry.add_to_hass(hass)
+    with patch.object(
+        FoxLED2S2Device,
+        "async_fetch_device_available_data",
+        async_fetch_device_available_data,
+    ), patch.object(
+        FoxR2S2Device,
+        "async_fetch_device_available_data",
+        async_fetch_device_available_data,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        coordinator.async_add_listener(callback(lambda: notifications.append(True)))
+        now = dt_util.utcnow()
+
+        for device in coordinator.get_all_devices():
+            coordinator.mark_device_active(device)
+        async_fire_time_changed(hass, now + timedelta(seconds=POOLING_INTERVAL))
+        await hass.async_block_till_done()
+        assert fetches == {LED2S2_MAC: 2, R2S2_MAC: 2}
+        assert not notifications
+
+        reported["state"] = True
+        for device in coordinator.get_all_devices():
+            coordinator.mark_device_active(device)
+        async_fire_time_changed(hass, now + timedelta(seconds=2 * POOLING_INTERVAL))
+        await hass.async_block_till_done()
+        assert fetches == {LED2S2_MAC: 3, R2S2_MAC: 3}
+        assert len(notifications) == 1
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
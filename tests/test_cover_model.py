@@ -0,0 +1,66 @@
+"""Tests of cover travel time model."""
+import pytest
+
+from custom_components.fandffox.cover_model import (
+    CALIBRATION_ALPHA,
+    CALIBRATION_SHRINK,
+    CoverTravelModel,
+)
+
+TRAVEL_TIME = 30
+
+
+def test_position_estimated_with_constant_speed():
+    """Position moves linearly towards target and stops there."""
+    model = CoverTravelModel(TRAVEL_TIME)
+    model.start(0, 100, now=0)
+    assert model.is_opening and not model.is_closing
+    assert model.end_time == TRAVEL_TIME
+    assert model.get_position(now=TRAVEL_TIME / 2) == 50
+    assert model.get_position(now=2 * TRAVEL_TIME) == 100
+
+    model.start(100, 40, now=0)
+    assert model.is_closing
+    assert model.end_time == pytest.approx(0.6 * TRAVEL_TIME)
+    assert model.get_position(now=TRAVEL_TIME / 4) == 75
+    assert model.get_position(now=TRAVEL_TIME) == 40
+
+
+def test_start_at_target_is_not_movement():
+    """Cover sent to its current position does not move."""
+    model = CoverTravelModel(TRAVEL_TIME)
+    model.start(30, 30, now=0)
+    assert not model.is_moving
+    assert model.get_position(now=10) == 30
+
+
+def test_finish_at_target_shrinks_travel_time():
+    """Cover at target when predicted end is polled may be faster than model."""
+    model = CoverTravelModel(TRAVEL_TIME)
+    model.start(0, 100, now=0)
+    assert model.finish(100, now=TRAVEL_TIME) is True
+    assert not model.is_moving
+    assert model.get_position() == 100
+    assert model.travel_time == pytest.approx(TRAVEL_TIME * CALIBRATION_SHRINK)
+
+
+def test_finish_short_of_target_calibrates_travel_time():
+    """Cover still moving at predicted end is slower than model."""
+    model = CoverTravelModel(TRAVEL_TIME)
+    model.start(0, 100, now=0)
+    assert model.finish(50, now=TRAVEL_TIME) is False
+    #Half of travel took full travel time
+    measured = 2 * TRAVEL_TIME
+    assert model.travel_time == pytest.approx(
+        TRAVEL_TIME + CALIBRATION_ALPHA * (measured - TRAVEL_TIME)
+    )
+    assert not model.is_moving
+    assert model.get_position() == 50
+
+
+def test_finish_without_movement_keeps_travel_time():
+    """Cover which did not move says nothing about its speed."""
+    model = CoverTravelModel(TRAVEL_TIME)
+    model.start(20, 80, now=0)
+    assert model.finish(20, now=TRAVEL_TIME) is False
+    assert model.travel_time == TRAVEL_TIME
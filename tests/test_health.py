@@ -0,0 +1,56 @@
+"""Tests of device health monitor."""
+from custom_components.fandffox.health import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    DeviceHealthMonitor,
+)
+
+MAC = "00:00:00:00:00:01"
+MIN_BACKOFF = 10
+MAX_BACKOFF = 600
+
+
+def test_circuit_opens_after_consecutive_failures():
+    """Device is skipped only after threshold of consecutive failures."""
+    monitor = DeviceHealthMonitor(MIN_BACKOFF, MAX_BACKOFF)
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD - 1):
+        monitor.record_failure(MAC, now=0)
+    assert not monitor.is_open(MAC)
+
+    monitor.record_failure(MAC, now=0)
+    assert monitor.is_open(MAC)
+    assert not monitor.is_probe_due(MAC, now=MIN_BACKOFF - 1)
+    assert monitor.is_probe_due(MAC, now=MIN_BACKOFF)
+
+
+def test_backoff_doubles_up_to_ceiling():
+    """Every failed probe doubles backoff until it reaches the ceiling."""
+    monitor = DeviceHealthMonitor(MIN_BACKOFF, MAX_BACKOFF)
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD - 1):
+        monitor.record_failure(MAC, now=0)
+    backoffs = []
+    for _ in range(8):
+        monitor.record_failure(MAC, now=0)
+        backoffs.append(monitor.get(MAC).retry_at)
+    assert backoffs == [10, 20, 40, 80, 160, 320, 600, 600]
+
+
+def test_backoff_bounded_after_many_failures():
+    """Backoff of device failing for a long time stays at the ceiling."""
+    monitor = DeviceHealthMonitor(MIN_BACKOFF, MAX_BACKOFF)
+    for _ in range(10000):
+        monitor.record_failure(MAC, now=0)
+    assert monitor.get(MAC).retry_at == MAX_BACKOFF
+
+
+def test_success_closes_circuit():
+    """First successful request closes circuit and tracks latency."""
+    monitor = DeviceHealthMonitor(MIN_BACKOFF, MAX_BACKOFF)
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        monitor.record_failure(MAC, now=0)
+
+    monitor.record_success(MAC, 0.1)
+    health = monitor.get(MAC)
+    assert not monitor.is_open(MAC)
+    assert health.consecutive_failures == 0
+    assert health.latency_ewma == 0.1
+    assert health.last_success is not None
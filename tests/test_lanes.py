@@ -0,0 +1,110 @@
+"""Tests of per-device request gate."""
+import asyncio
+
+import pytest
+
+from custom_components.fandffox.lanes import (
+    PRIORITY_COMMAND,
+    PRIORITY_CONFIRM,
+    PRIORITY_POLL,
+    DeviceRequestGate,
+)
+
+
+async def async_queue(gate: DeviceRequestGate, priority: int) -> asyncio.Task:
+    """Start waiting for turn in background."""
+    task = asyncio.create_task(gate.async_acquire(priority))
+    await asyncio.sleep(0)
+    return task
+
+
+async def test_single_request_at_a_time():
+    """Request waits until request in progress is released."""
+    gate = DeviceRequestGate()
+    assert await gate.async_acquire(PRIORITY_POLL) is True
+    waiter = await async_queue(gate, PRIORITY_POLL)
+    assert not waiter.done()
+
+    gate.release()
+    assert await waiter is True
+    gate.release()
+    #Gate is free again
+    assert await gate.async_acquire(PRIORITY_POLL) is True
+
+
+async def test_same_priority_served_in_order():
+    """Waiters of the same priority are granted turn in arrival order."""
+    gate = DeviceRequestGate()
+    await gate.async_acquire(PRIORITY_CONFIRM)
+    waiters = [await async_queue(gate, PRIORITY_CONFIRM) for _ in range(3)]
+
+    granted = []
+    for _ in waiters:
+        gate.release()
+        await asyncio.sleep(0)
+        granted.append([waiter.done() for waiter in waiters])
+    assert granted == [
+        [True, False, False],
+        [True, True, False],
+        [True, True, True],
+    ]
+
+
+async def test_command_served_before_confirm():
+    """Command queued later is granted turn before waiting confirm refresh."""
+    gate = DeviceRequestGate()
+    await gate.async_acquire(PRIORITY_CONFIRM)
+    confirm = await async_queue(gate, PRIORITY_CONFIRM)
+    command = await async_queue(gate, PRIORITY_COMMAND)
+
+    gate.release()
+    await asyncio.sleep(0)
+    assert command.done() and not confirm.done()
+    gate.release()
+    assert await confirm is True
+
+
+async def test_command_skips_queued_polls():
+    """Polls waiting for device are skipped when command arrives."""
+    gate = DeviceRequestGate()
+    await gate.async_acquire(PRIORITY_POLL)
+    polls = [await async_queue(gate, PRIORITY_POLL) for _ in range(2)]
+    confirm = await async_queue(gate, PRIORITY_CONFIRM)
+
+    command = await async_queue(gate, PRIORITY_COMMAND)
+    assert [await poll for poll in polls] == [False, False]
+    #Command still waits for request in progress
+    assert not command.done()
+
+    gate.release()
+    assert await command is True
+    gate.release()
+    assert await confirm is True
+
+
+async def test_cancelled_waiter_passes_granted_turn():
+    """Waiter cancelled after it was granted turn passes it to next one."""
+    gate = DeviceRequestGate()
+    await gate.async_acquire(PRIORITY_CONFIRM)
+    first = await async_queue(gate, PRIORITY_CONFIRM)
+    second = await async_queue(gate, PRIORITY_CONFIRM)
+
+    #Turn is granted, but waiter is cancelled before it resumes
+    gate.release()
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert await asyncio.wait_for(second, 1) is True
+
+
+async def test_cancelled_waiter_leaves_queue():
+    """Waiter cancelled before its turn does not block the gate."""
+    gate = DeviceRequestGate()
+    await gate.async_acquire(PRIORITY_CONFIRM)
+    waiter = await async_queue(gate, PRIORITY_CONFIRM)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    gate.release()
+    assert await gate.async_acquire(PRIORITY_POLL) is True
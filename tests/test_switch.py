@@ -0,0 +1,79 @@
+"""Tests of F&F Fox switch platform."""
+from unittest.mock import patch
+
+from foxrestapiclient.devices.const import DEVICE_TYPE_R2S2
+from foxrestapiclient.devices.fox_r2s2_device import FoxR2S2Device
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.fandffox.const import DOMAIN, SCHEMA_INPUT_REDISCOVERY_INTERVAL
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.helpers import entity_registry
+
+FIRST_MAC = "00:00:00:00:00:01"
+SECOND_MAC = "00:00:00:00:00:02"
+DISCOVERED_DEVICES = [
+    {
+        "name": f"r2s2-{index}",
+        "host": f"192.168.0.{10 + index}",
+        "api_key": "000",
+        "mac_addr": mac_addr,
+        "dev_type": DEVICE_TYPE_R2S2,
+        "channels": [1, 2],
+        "skip": False,
+    }
+    for index, mac_addr in enumerate((FIRST_MAC, SECOND_MAC))
+]
+
+
+async def test_expected_state_kept_until_own_refresh(hass):
+    """Refresh of other device does not drop expected state of switch."""
+    reported = {FIRST_MAC: False, SECOND_MAC: False}
+
+    async def async_fetch_device_available_data(device):
+        device.is_available = True
+        device.channel_one_state = reported[device.mac_addr]
+
+    async def async_update_channel_state(device, state, channel=None):
+        return True
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={"discovered_devices": DISCOVERED_DEVICES},
+        options={SCHEMA_INPUT_REDISCOVERY_INTERVAL: 0},
+    )
+    entry.add_to_hass(hass)
+    with patch.object(
+        FoxR2S2Device,
+        "async_fetch_device_available_data",
+        async_fetch_device_available_data,
+    ), patch.object(
+        FoxR2S2Device, "async_update_channel_state", async_update_channel_state
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        entity_id = entity_registry.async_get(hass).async_get_entity_id(
+            "switch", DOMAIN, f"{FIRST_MAC}-switch-1"
+        )
+        assert hass.states.get(entity_id).state == STATE_OFF
+
+        await hass.services.async_call(
+            "switch", "turn_on", {"entity_id": entity_id}, blocking=True
+        )
+        assert hass.states.get(entity_id).state == STATE_ON
+
+        #Pending tasks are not awaited, they include scheduled confirm refresh
+        #Notification without fetch of device keeps expected state
+        coordinator.async_update_listeners()
+        assert hass.states.get(entity_id).state == STATE_ON
+
+        #Refresh of other device keeps it too
+        await coordinator.async_refresh_devices([SECOND_MAC])
+        assert hass.states.get(entity_id).state == STATE_ON
+
+        #Refresh of device after command shows reported state
+        await coordinator.async_refresh_devices([FIRST_MAC])
+        assert hass.states.get(entity_id).state == STATE_OFF
+
+        assert await hass.config_entries.async_unload(entry.entry_id)